@@ -1,148 +1,1013 @@
-from collections import deque
+from array import array
+from collections import deque, namedtuple
+import heapq
+import json
+import struct
 import sys
 
+# ----------------------------- Bytecode -----------------------------
+# Instruction tuples such as ('ENTER_MUTEX', m) are compiled once into two
+# parallel arrays: an opcode per instruction and the index of its operand in a
+# constants list (index 0 holds None, for instructions without one). The
+# Scheduler dispatches on the opcode through a jump table instead of comparing
+# strings.
+OPNAMES = ('COMPUTE', 'ENTER_MUTEX', 'EXIT_MUTEX', 'WAIT_SEM', 'SIGNAL_SEM', 'INC', 'YIELD', 'SLEEP', 'BARRIER')
+OPCODES = {name: code for code, name in enumerate(OPNAMES)}
+COMPUTE, ENTER_MUTEX, EXIT_MUTEX, WAIT_SEM, SIGNAL_SEM, INC, YIELD, SLEEP, BARRIER = range(len(OPNAMES))
+
+class Program:
+    """Compiled instruction list. Immutable, so threads running the same
+    instructions can share one Program."""
+
+    __slots__ = ('code', 'args', 'consts')
+
+    def __init__(self, code, args, consts):
+        self.code = code
+        self.args = args
+        self.consts = consts
+
+    def __len__(self):
+        return len(self.code)
+
+    def decode(self, pc):
+        """The instruction tuple at pc, as it was written."""
+        arg = self.args[pc]
+        if arg:
+            return (OPNAMES[self.code[pc]], self.consts[arg])
+        return (OPNAMES[self.code[pc]],)
+
+    def rebind(self, mapping):
+        """A Program sharing this one's code, with operands replaced per
+        mapping {old operand: new operand}, e.g. another philosopher's forks."""
+        return Program(self.code, self.args, [mapping.get(operand, operand) for operand in self.consts])
+
+def compile_program(instructions):
+    """Compile instruction tuples into a Program. Unknown instructions raise ValueError."""
+    code = array('B')
+    args = array('i')
+    consts = [None]
+    index = {} # id(operand) -> slot in consts
+    for inst in instructions:
+        op = OPCODES.get(inst[0])
+        if op is None:
+            raise ValueError(f"Unknown instruction: {inst[0]}")
+        code.append(op)
+        if len(inst) > 1:
+            operand = inst[1]
+            slot = index.get(id(operand))
+            if slot is None:
+                slot = index[id(operand)] = len(consts)
+                consts.append(operand)
+            args.append(slot)
+        else:
+            args.append(0)
+    return Program(code, args, consts)
+
 # ----------------------------- Core Simulation Types -----------------------------
 class SimThread:
     NEW, READY, RUNNING, BLOCKED, TERMINATED = 'NEW','READY','RUNNING','BLOCKED','TERMINATED'
 
-    def __init__(self, tid, instructions):
+    __slots__ = ('tid', 'program', 'end', 'state', 'pc', 'priority', 'arrival_time', 'first_run',
+                 'finish_time', 'ready_since', 'wait_time', 'cpu_time', 'blocked_on', 'blocked_since')
+
+    def __init__(self, tid, instructions, priority=0):
+        # instructions: a list of tuples, or a Program shared with other threads
         self.tid = tid
-        self.instructions = deque(instructions)
+        self.program = instructions if isinstance(instructions, Program) else compile_program(instructions)
+        self.end = len(self.program)
         self.state = SimThread.NEW
         self.pc = 0
+        self.priority = priority # lower runs first (priority scheduling), nice value for CFS
+        # Timing, in ticks, filled in by the Scheduler
+        self.arrival_time = None
+        self.first_run = None
+        self.finish_time = None
+        self.ready_since = None
+        self.wait_time = 0
+        self.cpu_time = 0
+        # Wait-for graph edge: the Mutex, Semaphore or Barrier this thread is blocked on
+        self.blocked_on = None
+        self.blocked_since = None
+
+    def stats(self):
+        """Turnaround, waiting and response time of a finished thread."""
+        return {
+            'turnaround': self.finish_time - self.arrival_time,
+            'waiting': self.wait_time,
+            'response': self.first_run - self.arrival_time if self.first_run is not None else None,
+            'cpu': self.cpu_time,
+        }
+
+    @property
+    def instructions(self):
+        """The instructions not run yet, as tuples."""
+        return deque(self.program.decode(pc) for pc in range(self.pc, self.end))
 
     def is_done(self):
-        return len(self.instructions) == 0
+        return self.pc >= self.end
 
     def pop_inst(self):
-        if self.instructions:
+        if self.pc < self.end:
             self.pc += 1
-            return self.instructions.popleft()
+            return self.program.decode(self.pc - 1)
         return None
 
 # ----------------------------- Synchronization Primitives -----------------------------
 class Mutex:
+    """Owned lock with a FIFO wait queue.
+
+    Contention stats: acquisitions counts every acquire, blocked the ones
+    that had to wait; wait_total/wait_max are the ticks spent blocked and
+    hold_total/hold_max the ticks between being granted and releasing.
+    """
+
+    __slots__ = ('name', 'owner', 'wait_queue', 'acquisitions', 'blocked', 'wait_total', 'wait_max',
+                 'hold_total', 'hold_max', '_acquired_at')
+
     def __init__(self, name):
         self.name = name
         self.owner = None
         self.wait_queue = deque()
+        self.acquisitions = 0
+        self.blocked = 0
+        self.wait_total = 0
+        self.wait_max = 0
+        self.hold_total = 0
+        self.hold_max = 0
+        self._acquired_at = 0
 
     def acquire(self, thread, scheduler):
+        self.acquisitions += 1
         if self.owner is None:
             self.owner = thread
-            print(f"[{scheduler.time:03}] {thread.tid} acquired mutex {self.name}")
+            self._acquired_at = scheduler.time
+            scheduler.emit(MUTEX_ACQUIRE, thread, self)
             return True
         else:
-            print(f"[{scheduler.time:03}] {thread.tid} blocked on mutex {self.name}")
+            scheduler.emit(MUTEX_BLOCK, thread, self)
+            self.blocked += 1
             self.wait_queue.append(thread)
-            thread.state = SimThread.BLOCKED
+            scheduler.block(thread, self)
             return False
 
     def release(self, thread, scheduler):
         if self.owner != thread:
             raise RuntimeError(f"{thread.tid} tried to release mutex {self.name} but is not owner")
-        print(f"[{scheduler.time:03}] {thread.tid} released mutex {self.name}")
+        scheduler.emit(MUTEX_RELEASE, thread, self)
+        now = scheduler.time
+        hold = now - self._acquired_at
+        self.hold_total += hold
+        if hold > self.hold_max:
+            self.hold_max = hold
         if self.wait_queue:
             nxt = self.wait_queue.popleft()
             self.owner = nxt
-            nxt.state = SimThread.READY
-            scheduler.ready_queue.append(nxt)
-            print(f"[{scheduler.time:03}] {nxt.tid} unblocked and granted mutex {self.name}")
+            self._acquired_at = now
+            wait = scheduler.unblock(nxt)
+            self.wait_total += wait
+            if wait > self.wait_max:
+                self.wait_max = wait
+            scheduler.wake(nxt)
+            scheduler.emit(MUTEX_GRANT, nxt, self)
         else:
             self.owner = None
 
 class Semaphore:
+    """Counting semaphore with a FIFO wait queue.
+
+    acquisitions counts every wait, blocked the ones that had to wait, and
+    wait_total/wait_max the ticks spent blocked. A semaphore has no owner, so
+    there is no hold time; signals counts the signal calls instead.
+    """
+
+    __slots__ = ('name', 'value', 'wait_queue', 'acquisitions', 'blocked', 'wait_total', 'wait_max', 'signals')
+
     def __init__(self, name, initial):
         self.name = name
         self.value = initial
         self.wait_queue = deque()
+        self.acquisitions = 0
+        self.blocked = 0
+        self.wait_total = 0
+        self.wait_max = 0
+        self.signals = 0
 
     def wait(self, thread, scheduler):
+        self.acquisitions += 1
         if self.value > 0:
             self.value -= 1
-            print(f"[{scheduler.time:03}] {thread.tid} acquired semaphore {self.name} (value={self.value})")
+            scheduler.emit(SEM_ACQUIRE, thread, self, self.value)
             return True
         else:
-            print(f"[{scheduler.time:03}] {thread.tid} blocked on semaphore {self.name} (value={self.value})")
+            scheduler.emit(SEM_BLOCK, thread, self, self.value)
+            self.blocked += 1
             self.wait_queue.append(thread)
-            thread.state = SimThread.BLOCKED
+            scheduler.block(thread, self)
             return False
 
     def signal(self, scheduler):
         self.value += 1
-        print(f"[{scheduler.time:03}] semaphore {self.name} signaled (value={self.value})")
+        self.signals += 1
+        scheduler.emit(SEM_SIGNAL, None, self, self.value)
         if self.wait_queue:
             nxt = self.wait_queue.popleft()
-            nxt.state = SimThread.READY
-            scheduler.ready_queue.append(nxt)
+            wait = scheduler.unblock(nxt)
+            self.wait_total += wait
+            if wait > self.wait_max:
+                self.wait_max = wait
+            scheduler.wake(nxt)
             self.value -= 1
-            print(f"[{scheduler.time:03}] {nxt.tid} unblocked by semaphore {self.name} (value now={self.value})")
+            scheduler.emit(SEM_WAKE, nxt, self, self.value)
+
+class Barrier:
+    """Cyclic barrier for `parties` threads. A BARRIER instruction blocks until
+    the last party arrives; that thread releases all the waiting ones and the
+    barrier starts over for the next phase.
+
+    acquisitions counts arrivals, blocked the ones that had to wait, and
+    wait_total/wait_max the ticks spent waiting; releases counts the phases
+    completed.
+    """
+
+    __slots__ = ('name', 'parties', 'wait_queue', 'acquisitions', 'blocked', 'wait_total', 'wait_max', 'releases')
+
+    def __init__(self, name, parties):
+        self.name = name
+        self.parties = parties
+        self.wait_queue = deque()
+        self.acquisitions = 0
+        self.blocked = 0
+        self.wait_total = 0
+        self.wait_max = 0
+        self.releases = 0
+
+    def wait(self, thread, scheduler):
+        self.acquisitions += 1
+        if len(self.wait_queue) + 1 < self.parties:
+            self.blocked += 1
+            self.wait_queue.append(thread)
+            scheduler.emit(BARRIER_WAIT, thread, self, len(self.wait_queue))
+            scheduler.block(thread, self)
+            return False
+        scheduler.emit(BARRIER_RELEASE, thread, self, len(self.wait_queue))
+        self.releases += 1
+        while self.wait_queue:
+            nxt = self.wait_queue.popleft()
+            wait = scheduler.unblock(nxt)
+            self.wait_total += wait
+            if wait > self.wait_max:
+                self.wait_max = wait
+            scheduler.wake(nxt)
+        return True
+
+# ----------------------------- Logging -----------------------------
+class BufferedLog:
+    """Log sink that collects lines and writes them to the stream in large
+    batches, instead of one print per line. Call flush() at the end."""
+
+    def __init__(self, stream=None, capacity=8192):
+        self.stream = stream
+        self.capacity = capacity
+        self.lines = []
+
+    def __call__(self, line):
+        self.lines.append(line)
+        if len(self.lines) >= self.capacity:
+            self.flush()
+
+    def flush(self):
+        if self.lines:
+            stream = self.stream or sys.stdout
+            stream.write('\n'.join(self.lines) + '\n')
+            self.lines.clear()
+
+# ----------------------------- Events -----------------------------
+# The simulator reports what happens as typed records
+#   (time, kind, thread, subject, value)
+# kept in a preallocated ring buffer. Recording a record is a tuple store; it
+# only becomes text, JSON or bytes when the ring is drained into a sink, so
+# silent and machine-readable runs never format a message.
+#
+#   kind          thread   subject              value
+#   RUN           thread   Program              pc of the instruction
+#   MUTEX_*       thread   Mutex                -
+#   SEM_*         thread   Semaphore            value after the operation (SEM_SIGNAL: thread is None)
+#   INC           thread   shared key           new value
+#   SLEEP         thread   -                    wake-up time
+#   TERMINATE     thread   -                    -
+#   DEADLOCK      -        cycle (list)         -
+#   MAX_TICKS     -        -                    -
+#   MESSAGE       -        text from log()      -
+#   BARRIER_WAIT  thread   Barrier              threads now waiting
+#   BARRIER_RELEASE thread Barrier              threads released
+(RUN, MUTEX_ACQUIRE, MUTEX_BLOCK, MUTEX_RELEASE, MUTEX_GRANT, SEM_ACQUIRE, SEM_BLOCK, SEM_SIGNAL,
+ SEM_WAKE, INC_EVENT, SLEEP_EVENT, TERMINATE, DEADLOCK, MAX_TICKS, MESSAGE, BARRIER_WAIT,
+ BARRIER_RELEASE) = range(17)
+EVENT_NAMES = ('run', 'mutex_acquire', 'mutex_block', 'mutex_release', 'mutex_grant', 'sem_acquire',
+               'sem_block', 'sem_signal', 'sem_wake', 'inc', 'sleep', 'terminate', 'deadlock',
+               'max_ticks', 'message', 'barrier_wait', 'barrier_release')
+
+# Verbosity: an event is recorded when its level is <= the scheduler's verbosity
+QUIET, SYNC, DETAIL, TRACE = range(4)
+EVENT_LEVELS = (TRACE, SYNC, SYNC, SYNC, SYNC, SYNC, SYNC, SYNC, SYNC, DETAIL, DETAIL, SYNC, QUIET, QUIET, DETAIL,
+                SYNC, SYNC)
+
+_TEXT = (
+    lambda t, s, v: f"RUNNING {t.tid} -> {s.decode(v)}",
+    lambda t, s, v: f"{t.tid} acquired mutex {s.name}",
+    lambda t, s, v: f"{t.tid} blocked on mutex {s.name}",
+    lambda t, s, v: f"{t.tid} released mutex {s.name}",
+    lambda t, s, v: f"{t.tid} unblocked and granted mutex {s.name}",
+    lambda t, s, v: f"{t.tid} acquired semaphore {s.name} (value={v})",
+    lambda t, s, v: f"{t.tid} blocked on semaphore {s.name} (value={v})",
+    lambda t, s, v: f"semaphore {s.name} signaled (value={v})",
+    lambda t, s, v: f"{t.tid} unblocked by semaphore {s.name} (value now={v})",
+    lambda t, s, v: f"{t.tid} incremented {s} -> {v}",
+    lambda t, s, v: f"{t.tid} sleeping until {v}",
+    lambda t, s, v: f"{t.tid} terminated",
+    lambda t, s, v: f"DEADLOCK {_describe_cycle(s)}",
+    lambda t, s, v: "[!] reached max ticks, stopping simulation",
+    lambda t, s, v: s,
+    lambda t, s, v: f"{t.tid} waiting at barrier {s.name} ({v}/{s.parties})",
+    lambda t, s, v: f"{t.tid} reached barrier {s.name}, releasing {v} threads",
+)
+
+Event = namedtuple('Event', 'time kind thread subject value')
+
+def format_event(event):
+    """The human-readable line for an event, as the simulator used to print it."""
+    time, kind, thread, subject, value = event
+    if kind == MAX_TICKS:
+        return _TEXT[kind](thread, subject, value)
+    return f"[{time:03}] {_TEXT[kind](thread, subject, value)}"
+
+def _describe_cycle(cycle):
+    # T1 -> M2 -> T2 -> M1 -> T1
+    return " -> ".join(node.tid if isinstance(node, SimThread) else node.name for node in cycle)
+
+def _operand_name(operand):
+    return getattr(operand, 'name', operand)
+
+def event_fields(event):
+    """(time, event name, thread id, subject, value) with plain str/int values,
+    for machine-readable sinks. A RUN subject is the instruction, e.g. 'ENTER_MUTEX M'."""
+    time, kind, thread, subject, value = event
+    if kind == RUN:
+        inst = subject.decode(value)
+        subject = inst[0] if len(inst) == 1 else f"{inst[0]} {_operand_name(inst[1])}"
+    elif kind == DEADLOCK:
+        subject = _describe_cycle(subject)
+    elif subject is not None:
+        subject = str(_operand_name(subject))
+    return time, EVENT_NAMES[kind], thread.tid if thread is not None else None, subject, value
+
+class EventSink:
+    """Receives batches of event tuples from an EventLog."""
+
+    def write(self, events):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+class NullSink(EventSink):
+    """Discards events. The ring still holds the most recent ones for inspection."""
+
+    def write(self, events):
+        pass
+
+class TextSink(EventSink):
+    """Formats events as text lines. `out` is a stream, or a callable taking one
+    line such as print, list.append or a BufferedLog."""
+
+    def __init__(self, out=None):
+        self.out = out if out is not None else sys.stdout
+
+    def write(self, events):
+        out = self.out
+        if callable(out):
+            for event in events:
+                out(format_event(event))
+        else:
+            out.write(''.join(format_event(event) + '\n' for event in events))
+
+    def flush(self):
+        if hasattr(self.out, 'flush'):
+            self.out.flush()
+
+class JsonLinesSink(EventSink):
+    """One JSON object per event: {"time", "event", "thread", "subject", "value"}."""
+
+    KEYS = ('time', 'event', 'thread', 'subject', 'value') # "event" holds the name, e.g. "mutex_acquire"
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, events):
+        keys = self.KEYS
+        self.stream.write(''.join(
+            json.dumps(dict(zip(keys, event_fields(event)))) + '\n' for event in events))
+
+    def flush(self):
+        self.stream.flush()
+
+class BinarySink(EventSink):
+    """Compact binary events: a magic header, then one 26-byte record per event
+    (time i64, value i64, thread id u32, subject id u32, kind u8, has-value u8).
+    Thread ids and subjects are interned strings: the first use of a string is
+    preceded by a NAME record carrying its id and byte length, followed by the
+    UTF-8 bytes. Read the file back with read_binary_events()."""
+
+    MAGIC = b'SIMEVT\x00\x01'
+    RECORD = struct.Struct('<qqIIBB')
+    NAME = 0xFF
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._ids = {None: 0}
+        stream.write(self.MAGIC)
+
+    def _intern(self, text, out):
+        ident = self._ids.get(text)
+        if ident is None:
+            ident = self._ids[text] = len(self._ids)
+            data = text.encode('utf-8')
+            out.append(self.RECORD.pack(0, 0, ident, len(data), self.NAME, 0))
+            out.append(data)
+        return ident
+
+    def write(self, events):
+        out = []
+        pack = self.RECORD.pack
+        for event in events:
+            time, name, tid, subject, value = event_fields(event)
+            thread_id = self._intern(tid, out)
+            subject_id = self._intern(subject, out)
+            out.append(pack(time, value or 0, thread_id, subject_id, event[1], value is not None))
+        self.stream.write(b''.join(out))
+
+    def flush(self):
+        self.stream.flush()
+
+def read_binary_events(path):
+    """Yield (time, event name, thread id, subject, value) from a BinarySink file."""
+    record = BinarySink.RECORD
+    names = {0: None}
+    with open(path, 'rb') as f:
+        if f.read(len(BinarySink.MAGIC)) != BinarySink.MAGIC:
+            raise ValueError(f"{path} is not a simulator event file")
+        while True:
+            data = f.read(record.size)
+            if len(data) < record.size:
+                return
+            time, value, thread_id, subject_id, kind, has_value = record.unpack(data)
+            if kind == BinarySink.NAME:
+                names[thread_id] = f.read(subject_id).decode('utf-8')
+                continue
+            yield time, EVENT_NAMES[kind], names[thread_id], names[subject_id], value if has_value else None
+
+class EventLog:
+    """Preallocated ring buffer of event records.
+
+    Records accumulate until the ring is full or flush() is called, and are
+    then handed to every sink in one batch. The ring keeps the last `capacity`
+    records either way; iterate the log to inspect them.
+    """
+
+    def __init__(self, sinks=(), capacity=8192):
+        self.sinks = list(sinks)
+        self.capacity = capacity
+        self.count = 0 # records emitted so far
+        self._ring = [None] * capacity
+        self._next = 0 # slot for the next record
+        self._pending = 0 # first slot not yet written to the sinks
+
+    def emit(self, time, kind, thread=None, subject=None, value=None):
+        i = self._next
+        self._ring[i] = (time, kind, thread, subject, value)
+        self.count += 1
+        i += 1
+        if i == self.capacity:
+            self._drain(i)
+            i = 0
+        self._next = i
+
+    def _drain(self, end):
+        if end > self._pending:
+            batch = self._ring[self._pending:end]
+            for sink in self.sinks:
+                sink.write(batch)
+        self._pending = end % self.capacity
+
+    def flush(self):
+        self._drain(self._next)
+        for sink in self.sinks:
+            sink.flush()
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def __iter__(self):
+        ring, i = self._ring, self._next
+        records = ring[i:] + ring[:i] if self.count >= self.capacity else ring[:i]
+        return map(Event._make, records)
+
+# ----------------------------- Scheduling Policies -----------------------------
+# A policy owns the ready threads. The Scheduler calls
+#   add(thread)             when a thread becomes ready (thread.ready_since is set)
+#   pop()                   to pick the next thread to run
+#   quantum(thread)         instructions it may run before being preempted
+#   ran(thread, used, ...)  after it leaves the CPU, with the instructions it used
+# A thread also gives up the CPU early when it blocks, finishes or YIELDs.
+
+class RoundRobin:
+    """FIFO ready queue with a fixed quantum. quantum=1 is the original scheduler."""
+
+    name = 'Round Robin'
+
+    def __init__(self, quantum=1):
+        self.queue = deque()
+        self._quantum = quantum
+
+    def __len__(self):
+        return len(self.queue)
+
+    def add(self, thread):
+        self.queue.append(thread)
+
+    def pop(self):
+        return self.queue.popleft()
+
+    def quantum(self, thread):
+        return self._quantum
+
+    def ran(self, thread, used, blocked=False):
+        pass
+
+
+class PriorityScheduling(RoundRobin):
+    """Lowest thread.priority first, FIFO among equals, kept in a heap.
+
+    With aging=A a waiting thread gains one priority level every A ticks.
+    Aging is linear in the time spent waiting, so the order of two waiting
+    threads never changes and the heap key can be fixed at insertion:
+    priority * A + ready_since.
+    """
+
+    name = 'Priority'
+
+    def __init__(self, quantum=1, aging=None):
+        super().__init__(quantum)
+        self.aging = aging
+        self.queue = [] # heap of (key, seq, thread)
+        self._seq = 0
+
+    def add(self, thread):
+        self._seq += 1
+        if self.aging:
+            key = thread.priority * self.aging + thread.ready_since
+        else:
+            key = thread.priority
+        heapq.heappush(self.queue, (key, self._seq, thread))
+
+    def pop(self):
+        return heapq.heappop(self.queue)[2]
+
+
+class MLFQ:
+    """Multilevel feedback queue.
+
+    A thread starts at level 0 and drops one level each time it uses its whole
+    quantum there; blocking or yielding early keeps its level. Every
+    boost_interval ticks all threads go back to level 0, so long-running
+    threads are not starved. Dispatch scans the (few) levels for the first
+    non-empty queue.
+    """
+
+    name = 'MLFQ'
+
+    def __init__(self, quantums=(1, 2, 4), boost_interval=100):
+        self.quantums = quantums
+        self.boost_interval = boost_interval
+        self.levels = [deque() for _ in quantums]
+        self._level = {} # thread -> level, missing means 0
+        self._count = 0
+        self._next_boost = boost_interval
+        self.now = 0 # set by the Scheduler before each dispatch
+
+    def __len__(self):
+        return self._count
+
+    def _boost(self):
+        while self.now >= self._next_boost:
+            self._next_boost += self.boost_interval
+            top = self.levels[0]
+            for queue in self.levels[1:]:
+                top.extend(queue)
+                queue.clear()
+            self._level.clear()
+
+    def add(self, thread):
+        self.levels[self._level.get(thread, 0)].append(thread)
+        self._count += 1
+
+    def pop(self):
+        self._boost()
+        self._count -= 1
+        for queue in self.levels:
+            if queue:
+                return queue.popleft()
+
+    def quantum(self, thread):
+        return self.quantums[self._level.get(thread, 0)]
+
+    def ran(self, thread, used, blocked=False):
+        level = self._level.get(thread, 0)
+        if used >= self.quantums[level] and level + 1 < len(self.quantums):
+            self._level[thread] = level + 1
+
+
+class CFS:
+    """Completely fair scheduling: run the thread with the lowest virtual runtime.
+
+    Ready threads sit in a heap on vruntime. A thread's vruntime grows by the
+    instructions it runs scaled by 1024 / weight, where weight = 1024 / 1.25 **
+    priority (priority acts as the nice value). Its slice is target_latency
+    split over the runnable threads, but never below min_granularity. A thread
+    joining the queue starts no lower than min_vruntime, so sleepers cannot
+    bank CPU time.
+    """
+
+    name = 'CFS'
+
+    def __init__(self, target_latency=6, min_granularity=1):
+        self.target_latency = target_latency
+        self.min_granularity = min_granularity
+        self.queue = [] # heap of (vruntime, seq, thread)
+        self.vruntime = {} # thread -> vruntime
+        self.min_vruntime = 0
+        self._seq = 0
+
+    def __len__(self):
+        return len(self.queue)
+
+    def add(self, thread):
+        vruntime = max(self.vruntime.get(thread, 0), self.min_vruntime)
+        self.vruntime[thread] = vruntime
+        self._seq += 1
+        heapq.heappush(self.queue, (vruntime, self._seq, thread))
+
+    def pop(self):
+        vruntime, _, thread = heapq.heappop(self.queue)
+        self.min_vruntime = max(self.min_vruntime, vruntime)
+        return thread
+
+    def quantum(self, thread):
+        return max(self.min_granularity, self.target_latency // (len(self.queue) + 1))
+
+    def ran(self, thread, used, blocked=False):
+        self.vruntime[thread] += used * 1.25 ** thread.priority
+
+
+POLICIES = {
+    'rr': RoundRobin,
+    'priority': PriorityScheduling,
+    'mlfq': MLFQ,
+    'cfs': CFS,
+}
 
 # ----------------------------- Scheduler -----------------------------
 class Scheduler:
-    def __init__(self, time_slice=1):
+    """Runs SimThreads one instruction per tick under a scheduling policy.
+
+    The policy defaults to RoundRobin(time_slice); with time_slice=1 that is
+    the original behaviour, one instruction per turn in FIFO order.
+
+    run() is the original tick loop: the clock advances by one per loop
+    iteration, idle ticks included. run_events() is the event-driven mode:
+    ready threads run back to back and, when none is ready, the clock jumps
+    straight to the next wakeup in the sleepers heap. Both produce the same
+    interleaving.
+
+    What happens is recorded as events (see EventLog) up to `verbosity`.
+    `sink` receives them: an EventSink, or a callable/stream taking text
+    lines, which is wrapped in a TextSink. The default is print; pass a
+    BufferedLog to batch output, a JsonLinesSink or BinarySink for tools, or
+    sink=None to record nothing. Events reach the sink in batches and at the
+    end of run()/run_events().
+    """
+
+    def __init__(self, time_slice=1, sink=print, policy=None, verbosity=TRACE, capacity=8192):
         self.time_slice = time_slice
-        self.ready_queue = deque()
+        self.policy = policy if policy is not None else RoundRobin(time_slice)
+        self.threads = []
+        self.current = None # thread in the middle of its quantum
+        self._ready = 0 # threads held by the policy
+        self._used = 0
+        self._quantum = 0
         self.time = 0
+        self._capacity = capacity
+        self._verbosity = verbosity
+        self.sink = sink
+        self.primitives = {} # Mutexes, Semaphores and Barriers used by the threads, in first-use order
+        self.deadlocks = [] # (time, cycle) for every wait-for cycle found
+        self._sleepers = [] # heap of (wake_time, seq, thread)
+        self._seq = 0
+        # Jump table: opcode -> handler(thread, operand). Subclasses override the handlers.
+        self._ops = (self._op_nop, self._op_enter_mutex, self._op_exit_mutex, self._op_wait_sem,
+                     self._op_signal_sem, self._op_inc, self._op_nop, self._op_sleep, self._op_barrier)
 
-    def add_thread(self, thread):
+    @property
+    def sink(self):
+        return self._sink
+
+    @sink.setter
+    def sink(self, sink):
+        # A new sink starts a new EventLog; sink=None disables events altogether
+        self._sink = sink
+        if sink is None:
+            self.events = None
+            self.verbosity = -1
+        else:
+            self.events = EventLog([sink if isinstance(sink, EventSink) else TextSink(sink)], self._capacity)
+            self.verbosity = self._verbosity
+        self._trace = self.verbosity >= TRACE
+
+    def emit(self, kind, thread=None, subject=None, value=None):
+        if EVENT_LEVELS[kind] <= self.verbosity:
+            self.events.emit(self.time, kind, thread, subject, value)
+
+    def log(self, message):
+        """Record a free-form text message."""
+        self.emit(MESSAGE, None, message)
+
+    def flush(self):
+        """Hand every recorded event to the sink."""
+        if self.events is not None:
+            self.events.flush()
+
+    def _make_ready(self, thread, at):
         thread.state = SimThread.READY
-        self.ready_queue.append(thread)
+        thread.ready_since = at
+        self._ready += 1
+        self.policy.add(thread)
+
+    def add_thread(self, thread):
+        thread.arrival_time = self.time
+        self.threads.append(thread)
+        for operand in thread.program.consts:
+            if isinstance(operand, (Mutex, Semaphore, Barrier)):
+                self.primitives.setdefault(operand, None)
+        self._make_ready(thread, self.time)
+
+    def wake(self, thread):
+        """Make a thread blocked on a primitive runnable again. It is woken by
+        the instruction running this tick, so like a preempted thread it can
+        run from the next tick."""
+        self._make_ready(thread, self.time + 1)
+
+    def block(self, thread, primitive):
+        """Add the wait-for edge thread -> primitive and look for a deadlock.
+
+        A blocked thread waits on exactly one primitive and a mutex has one
+        owner, so the mutex edges form chains. A new edge can only close a
+        cycle through itself, found by following owners from the mutex.
+        Semaphores have no owner and end a chain, and so does a chain that
+        runs into an older deadlock.
+        """
+        thread.state = SimThread.BLOCKED
+        thread.blocked_on = primitive
+        thread.blocked_since = self.time
+        cycle = [thread]
+        while isinstance(primitive, Mutex):
+            cycle.append(primitive)
+            owner = primitive.owner
+            if owner is thread:
+                cycle.append(thread)
+                self.deadlocks.append((self.time, cycle))
+                self.emit(DEADLOCK, None, cycle)
+                return
+            if owner in cycle:
+                return
+            cycle.append(owner)
+            primitive = owner.blocked_on
+
+    def unblock(self, thread):
+        """Remove thread's wait-for edge and return the ticks it was blocked."""
+        thread.blocked_on = None
+        return self.time - thread.blocked_since
+
+    def sleep(self, thread, ticks):
+        thread.state = SimThread.BLOCKED
+        self._seq += 1
+        heapq.heappush(self._sleepers, (self.time + ticks, self._seq, thread))
+
+    def _wake_sleepers(self):
+        sleepers = self._sleepers
+        while sleepers and sleepers[0][0] <= self.time:
+            self._make_ready(heapq.heappop(sleepers)[2], self.time)
+
+    def _terminate(self, thread, at):
+        thread.state = SimThread.TERMINATED
+        thread.finish_time = at
+        self.emit(TERMINATE, thread)
+
+    def _dispatch(self):
+        # Next thread to run, or None when nothing is ready
+        if not self._ready:
+            return None
+        self._ready -= 1
+        policy = self.policy
+        now = policy.now = self.time
+        thread = policy.pop()
+        thread.wait_time += now - thread.ready_since
+        if thread.first_run is None:
+            thread.first_run = now
+        self._used = 0
+        self._quantum = policy.quantum(thread)
+        return thread
+
+    def _step(self, thread):
+        # Run one instruction of thread. Returns thread if it keeps the CPU,
+        # otherwise hands it back to the policy (or retires it) and returns None.
+        # A thread that blocked on its last instruction is retired when it is
+        # dispatched again, which takes a tick.
+        pc = thread.pc
+        if pc >= thread.end:
+            self._terminate(thread, self.time)
+            return None
+        thread.state = SimThread.RUNNING
+        program = thread.program
+        thread.pc = pc + 1
+        if self._trace:
+            self.events.emit(self.time, RUN, thread, program, pc)
+        op = program.code[pc]
+        self._ops[op](thread, program.consts[program.args[pc]])
+        thread.cpu_time += 1
+        self._used += 1
+        if thread.state == SimThread.BLOCKED:
+            self.policy.ran(thread, self._used, blocked=True)
+            return None
+        if thread.pc >= thread.end:
+            self.policy.ran(thread, self._used)
+            self._terminate(thread, self.time + 1)
+            return None
+        if self._used >= self._quantum or op == YIELD:
+            self.policy.ran(thread, self._used)
+            self._make_ready(thread, self.time + 1)
+            return None
+        return thread
 
     def run(self, max_ticks=1000):
         ticks = 0
-        while self.ready_queue and ticks < max_ticks:
-            thread = self.ready_queue.popleft()
-            if thread.state == SimThread.BLOCKED:
-                continue
-            thread.state = SimThread.RUNNING
-            inst = thread.pop_inst()
-            print(f"[{self.time:03}] RUNNING {thread.tid} -> {inst}")
-            self.execute_instruction(thread, inst)
-            if thread.is_done():
-                thread.state = SimThread.TERMINATED
-                print(f"[{self.time:03}] {thread.tid} terminated")
-            elif thread.state == SimThread.RUNNING:
-                thread.state = SimThread.READY
-                self.ready_queue.append(thread)
-            self.time += 1
-            ticks += 1
-        if ticks >= max_ticks:
-            print("[!] reached max ticks, stopping simulation")
+        try:
+            while (self.current is not None or self._ready or self._sleepers) and ticks < max_ticks:
+                self._wake_sleepers()
+                thread = self.current if self.current is not None else self._dispatch()
+                if thread is not None:
+                    self.current = self._step(thread)
+                self.time += 1
+                ticks += 1
+            if ticks >= max_ticks:
+                self.emit(MAX_TICKS)
+        finally:
+            self.flush() # also when an instruction raises, so the trace leading up to it is kept
+
+    def run_events(self, max_time=None):
+        """Event-driven run until every thread has finished or is blocked for
+        good, or the clock reaches max_time. Returns the number of
+        instructions executed."""
+        sleepers = self._sleepers
+        step = self._step
+        executed = 0
+        try:
+            while True:
+                if sleepers and sleepers[0][0] <= self.time:
+                    self._wake_sleepers()
+                thread = self.current
+                if thread is None:
+                    thread = self._dispatch()
+                    if thread is None:
+                        if not sleepers:
+                            break
+                        self.time = sleepers[0][0] # jump to the next wakeup
+                        continue
+                if max_time is not None and self.time >= max_time:
+                    break
+                self.current = step(thread)
+                self.time += 1
+                executed += 1
+        finally:
+            self.flush()
+        return executed
+
+    def stalled(self):
+        """Threads still blocked on a Mutex, Semaphore or Barrier, with what they wait on."""
+        return [(t, t.blocked_on) for t in self.threads if t.blocked_on is not None]
+
+    def contention_stats(self):
+        """{primitive name: stats} for every Mutex, Semaphore and Barrier the
+        threads use. hold_total and hold_max are None except for mutexes."""
+        report = {}
+        for prim in self.primitives:
+            mutex = isinstance(prim, Mutex)
+            report[prim.name] = {
+                'kind': 'mutex' if mutex else 'barrier' if isinstance(prim, Barrier) else 'semaphore',
+                'acquisitions': prim.acquisitions,
+                'blocked': prim.blocked,
+                'wait_total': prim.wait_total,
+                'wait_max': prim.wait_max,
+                'hold_total': prim.hold_total if mutex else None,
+                'hold_max': prim.hold_max if mutex else None,
+            }
+        return report
+
+    def print_report(self, out=print):
+        """Contention per primitive, then any deadlocks and stalled threads."""
+        out("\n--- Synchronization Report ---")
+        out(f"{'primitive':<12} {'kind':<9} {'acquires':>8} {'blocked':>7} {'wait tot':>8} "
+              f"{'wait max':>8} {'hold tot':>8} {'hold max':>8}")
+        for name, st in self.contention_stats().items():
+            hold_total = '-' if st['hold_total'] is None else st['hold_total']
+            hold_max = '-' if st['hold_max'] is None else st['hold_max']
+            out(f"{name:<12} {st['kind']:<9} {st['acquisitions']:>8} {st['blocked']:>7} {st['wait_total']:>8} "
+                  f"{st['wait_max']:>8} {hold_total:>8} {hold_max:>8}")
+        for time, cycle in self.deadlocks:
+            out(f"Deadlock at [{time:03}]: {_describe_cycle(cycle)}")
+        for thread, prim in self.stalled():
+            out(f"{thread.tid} still blocked on {prim.name} since [{thread.blocked_since:03}]")
+
+    def stats(self):
+        """{tid: {'turnaround', 'waiting', 'response', 'cpu'}} for every finished thread."""
+        return {t.tid: t.stats() for t in self.threads if t.finish_time is not None}
+
+    def print_stats(self, out=print):
+        stats = self.stats()
+        out(f"\n--- Thread Times ({getattr(self.policy, 'name', type(self.policy).__name__)}) ---")
+        out(f"{'thread':<8} {'turnaround':>10} {'waiting':>8} {'response':>8} {'cpu':>6}")
+        for tid, st in stats.items():
+            out(f"{tid:<8} {st['turnaround']:>10} {st['waiting']:>8} {st['response']:>8} {st['cpu']:>6}")
+        if stats:
+            n = len(stats)
+            out(f"{'average':<8} {sum(st['turnaround'] for st in stats.values()) / n:>10.2f} "
+                  f"{sum(st['waiting'] for st in stats.values()) / n:>8.2f} "
+                  f"{sum(st['response'] for st in stats.values()) / n:>8.2f}")
 
     def execute_instruction(self, thread, inst):
-        op = inst[0]
-        if op == 'COMPUTE':
-            pass
-        elif op == 'ENTER_MUTEX':
-            mutex = inst[1]
-            ok = mutex.acquire(thread, self)
-            if not ok: return
-        elif op == 'EXIT_MUTEX':
-            mutex = inst[1]
-            mutex.release(thread, self)
-        elif op == 'WAIT_SEM':
-            sem = inst[1]
-            ok = sem.wait(thread, self)
-            if not ok: return
-        elif op == 'SIGNAL_SEM':
-            sem = inst[1]
-            sem.signal(self)
-        elif op == 'INC':
-            key = inst[1]
-            self.shared[key] = self.shared.get(key, 0) + 1
-            print(f"[{self.time:03}] {thread.tid} incremented {key} -> {self.shared[key]}")
-        elif op == 'YIELD':
-            pass
-        else:
-            raise ValueError(f"Unknown instruction: {op}")
+        """Run one instruction tuple outside a compiled program."""
+        op = OPCODES.get(inst[0])
+        if op is None:
+            raise ValueError(f"Unknown instruction: {inst[0]}")
+        self._ops[op](thread, inst[1] if len(inst) > 1 else None)
+
+    # Instruction handlers. A handler that blocks the thread sets its state to BLOCKED.
+    def _op_nop(self, thread, arg):
+        pass # COMPUTE and YIELD; the scheduler requeues a thread after YIELD
+
+    def _op_enter_mutex(self, thread, mutex):
+        mutex.acquire(thread, self)
+
+    def _op_exit_mutex(self, thread, mutex):
+        mutex.release(thread, self)
+
+    def _op_wait_sem(self, thread, sem):
+        sem.wait(thread, self)
+
+    def _op_signal_sem(self, thread, sem):
+        sem.signal(self)
+
+    def _op_inc(self, thread, key):
+        shared = self.shared
+        shared[key] = shared.get(key, 0) + 1
+        self.emit(INC_EVENT, thread, key, shared[key])
+
+    def _op_sleep(self, thread, ticks):
+        self.sleep(thread, ticks)
+        self.emit(SLEEP_EVENT, thread, None, self.time + ticks)
+
+    def _op_barrier(self, thread, barrier):
+        barrier.wait(thread, self)
 
 class DemoScheduler(Scheduler):
-    def __init__(self, time_slice=1):
-        super().__init__(time_slice)
+    def __init__(self, time_slice=1, sink=print, policy=None, verbosity=TRACE, capacity=8192):
+        super().__init__(time_slice, sink, policy, verbosity, capacity)
         self.shared = {}
 
 # ----------------------------- Demo Scenarios -----------------------------
+# Every demo writes its output a line at a time to out(line): print by
+# default, or e.g. queue.put to stream it to a GUI thread.
+def _run(sched, event=False, stats=False, out=print):
+    # Tick loop, or the event-driven loop with output batched on stdout
+    if event:
+        if out is print:
+            sched.sink = BufferedLog()
+        sched.run_events()
+    else:
+        sched.run()
+    if stats:
+        sched.print_stats(out)
+        sched.print_report(out)
+
 def make_counter_threads(increments=5, use_mutex=None):
     insts = []
     for _ in range(increments):
@@ -151,31 +1016,32 @@ def make_counter_threads(increments=5, use_mutex=None):
         insts.append(('INC', 'counter'))
         if use_mutex: insts.append(('EXIT_MUTEX', use_mutex))
         insts.append(('YIELD',))
-    t1 = SimThread('T1', insts.copy())
-    t2 = SimThread('T2', insts.copy())
+    program = compile_program(insts) # both threads run the same compiled code
+    t1 = SimThread('T1', program)
+    t2 = SimThread('T2', program)
     return [t1, t2]
 
-def demo_race(increments=5):
-    print('\\n========== RACE (no synchronization) ==========')
-    sched = DemoScheduler()
+def demo_race(increments=5, event=False, policy=None, out=print):
+    out('\\n========== RACE (no synchronization) ==========')
+    sched = DemoScheduler(sink=out, policy=policy)
     threads = make_counter_threads(increments=increments)
     for t in threads:
         sched.add_thread(t)
-    sched.run()
-    print(f"Final counter (unsynchronized): {sched.shared.get('counter', 0)}")
+    _run(sched, event, policy is not None, out)
+    out(f"Final counter (unsynchronized): {sched.shared.get('counter', 0)}")
 
-def demo_mutex(increments=5):
-    print('\\n========== MUTEX PROTECTED ==========')
+def demo_mutex(increments=5, event=False, policy=None, out=print):
+    out('\\n========== MUTEX PROTECTED ==========')
     m = Mutex('M')
-    sched = DemoScheduler()
+    sched = DemoScheduler(sink=out, policy=policy)
     threads = make_counter_threads(increments=increments, use_mutex=m)
     for t in threads:
         sched.add_thread(t)
-    sched.run()
-    print(f"Final counter (mutex): {sched.shared.get('counter', 0)}")
+    _run(sched, event, policy is not None, out)
+    out(f"Final counter (mutex): {sched.shared.get('counter', 0)}")
 
-def demo_semaphore(increments=3):
-    print('\\n========== SEMAPHORE DEMO ==========')
+def demo_semaphore(increments=3, event=False, policy=None, out=print):
+    out('\\n========== SEMAPHORE DEMO ==========')
     pool = Semaphore('POOL', initial=2)
     def make_worker(name, times=3):
         insts = []
@@ -185,14 +1051,14 @@ def demo_semaphore(increments=3):
             insts.append(('SIGNAL_SEM', pool))
             insts.append(('YIELD',))
         return SimThread(name, insts)
-    sched = Scheduler()
+    sched = Scheduler(sink=out, policy=policy)
     for i in range(4):
         t = make_worker(f'W{i+1}', times=increments)
         sched.add_thread(t)
-    sched.run()
+    _run(sched, event, policy is not None, out)
 
-def demo_producer_consumer(items=3):
-    print('\\n========== PRODUCER-CONSUMER ==========')
+def demo_producer_consumer(items=3, event=False, policy=None, out=print):
+    out('\\n========== PRODUCER-CONSUMER ==========')
     mutex = Mutex('buf_mutex')
     empty = Semaphore('empty', 2)
     full = Semaphore('full', 0)
@@ -219,27 +1085,60 @@ def demo_producer_consumer(items=3):
             insts.append(('YIELD',))
         return SimThread(name, insts)
 
-    sched = DemoScheduler()
+    sched = DemoScheduler(sink=out, policy=policy)
     sched.add_thread(make_producer('P1', items))
     sched.add_thread(make_consumer('C1', items))
-    sched.run()
-    print(f"Produced: {sched.shared.get('produced', 0)}, Consumed: {sched.shared.get('consumed', 0)}")
+    _run(sched, event, policy is not None, out)
+    out(f"Produced: {sched.shared.get('produced', 0)}, Consumed: {sched.shared.get('consumed', 0)}")
+
+def demo_deadlock(event=False, policy=None, out=print):
+    out('\n========== DEADLOCK (lock ordering) ==========')
+    m1 = Mutex('M1')
+    m2 = Mutex('M2')
+    sched = DemoScheduler(sink=out, policy=policy)
+    # T1 takes M1 then M2, T2 takes M2 then M1
+    sched.add_thread(SimThread('T1', [('ENTER_MUTEX', m1), ('COMPUTE',), ('ENTER_MUTEX', m2),
+                                      ('INC', 'counter'), ('EXIT_MUTEX', m2), ('EXIT_MUTEX', m1)]))
+    sched.add_thread(SimThread('T2', [('ENTER_MUTEX', m2), ('COMPUTE',), ('ENTER_MUTEX', m1),
+                                      ('INC', 'counter'), ('EXIT_MUTEX', m1), ('EXIT_MUTEX', m2)]))
+    _run(sched, event, True, out)
+
+DEMOS = {
+    'race': demo_race,
+    'mutex_demo': demo_mutex,
+    'semaphore_demo': demo_semaphore,
+    'prod_cons': demo_producer_consumer,
+    'deadlock': demo_deadlock,
+}
+ALL_DEMOS = ('race', 'mutex_demo', 'semaphore_demo', 'prod_cons')
+
+def run_demo(name, out=print, event=False, policy=None):
+    """Run a demo from DEMOS, or 'all', in this process.
+
+    Output goes to out(line). policy is a name from POLICIES, a policy
+    instance, or None for the default round robin without the stats.
+    """
+    if name != 'all' and name not in DEMOS:
+        raise ValueError(f"Unknown demo: {name}")
+    for demo in ALL_DEMOS if name == 'all' else (name,):
+        # A policy keeps state between runs, so each demo gets its own
+        if isinstance(policy, str):
+            demo_policy = POLICIES[policy]()
+        elif policy is not None and name == 'all':
+            demo_policy = type(policy)()
+        else:
+            demo_policy = policy
+        DEMOS[demo](event=event, policy=demo_policy, out=out)
 
 # ----------------------------- Main -----------------------------
 if __name__ == '__main__':
     arg = sys.argv[1] if len(sys.argv) > 1 else 'all'
-    if arg == 'race':
-        demo_race()
-    elif arg == 'mutex_demo':
-        demo_mutex()
-    elif arg == 'semaphore_demo':
-        demo_semaphore()
-    elif arg == 'prod_cons':
-        demo_producer_consumer()
-    elif arg == 'all':
-        demo_race()
-        demo_mutex()
-        demo_semaphore()
-        demo_producer_consumer()
+    event = 'event' in sys.argv[2:] # e.g. "race event": event-driven run with buffered output
+    # e.g. "prod_cons mlfq": run under a scheduling policy and print the thread times
+    policy = next((a for a in sys.argv[2:] if a in POLICIES), None)
+    if 'stats' in sys.argv[2:] and policy is None: # thread times and the synchronization report
+        policy = 'rr'
+    if arg in DEMOS or arg == 'all':
+        run_demo(arg, event=event, policy=policy)
     else:
-        print("Use: race | mutex_demo | semaphore_demo | prod_cons | all")
+        print("Use: race | mutex_demo | semaphore_demo | prod_cons | deadlock | all  [event] [stats] [rr | priority | mlfq | cfs]")
@@ -0,0 +1,25 @@
+from bisect import bisect_left
+
+
+def clook_disk_scheduling(requests, head, presorted=False):
+    # Like C-SCAN, but the head jumps straight from the highest request to the lowest one
+    ordered = requests if presorted else sorted(requests)
+    split = bisect_left(ordered, head)  # ordered[:split] < head <= ordered[split:]
+
+    seek_sequence = []
+    seek_time = 0
+    current = head
+
+    for i in range(split, len(ordered)):
+        r = ordered[i]
+        seek_sequence.append(r)
+        seek_time += abs(current - r)
+        current = r
+
+    for i in range(split):  # the first step includes the jump back to the lowest request
+        r = ordered[i]
+        seek_sequence.append(r)
+        seek_time += abs(current - r)
+        current = r
+
+    return seek_sequence, seek_time
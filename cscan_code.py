@@ -1,23 +1,28 @@
-def cscan_disk_scheduling(requests, head, disk_size):
-    requests.sort()
-    left = [r for r in requests if r < head]
-    right = [r for r in requests if r >= head]
+from bisect import bisect_left
+
+
+def cscan_disk_scheduling(requests, head, disk_size, presorted=False):
+    # The caller's list is left untouched; pass presorted=True to skip the sort
+    ordered = requests if presorted else sorted(requests)
+    split = bisect_left(ordered, head)  # ordered[:split] < head <= ordered[split:]
 
     seek_sequence = []
     seek_time = 0
     current = head
 
-    for r in right:
+    for i in range(split, len(ordered)):
+        r = ordered[i]
         seek_sequence.append(r)
         seek_time += abs(current - r)
         current = r
 
-    if left:
+    if split:
         seek_time += abs(current - (disk_size - 1))  # go to end
         seek_time += disk_size - 1  # jump to start
         current = 0
 
-        for r in left:
+        for i in range(split):
+            r = ordered[i]
             seek_sequence.append(r)
             seek_time += abs(current - r)
             current = r
@@ -0,0 +1,189 @@
+# Benchmarks for the disk scheduling algorithms on synthetic request traces.
+#
+# Usage:
+#   python disk_benchmark.py                          # every pattern, 10 .. 10^7 requests
+#   python disk_benchmark.py --sizes 1000 100000 --output bench.json
+#   python disk_benchmark.py --baseline old.json      # flag slowdowns against an earlier run
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+from itertools import accumulate
+
+from disk_scheduling import (np, fcfs_disk_schedule, scan_disk_scheduling, cscan_disk_scheduling,
+                             sstf_disk_scheduling, look_disk_scheduling, clook_disk_scheduling)
+
+SIZES = (10, 10**2, 10**3, 10**4, 10**5, 10**6, 10**7)
+
+# --- Workload generators ---
+# Each returns an array('i') of cylinders in [0, disk_size), reproducible from the seed.
+
+def uniform_requests(n, disk_size, seed=0):
+    rng = random.Random(seed)
+    return array('i', (rng.randrange(disk_size) for _ in range(n)))
+
+
+def zipf_hotspot_requests(n, disk_size, seed=0, hotspots=64, skew=1.2, spread=4):
+    """Most requests land near a few hot cylinders; hotspot k is hit with weight 1/k^skew."""
+    rng = random.Random(seed)
+    centers = [rng.randrange(disk_size) for _ in range(hotspots)]
+    cum_weights = list(accumulate(1 / (k ** skew) for k in range(1, hotspots + 1)))
+    picks = rng.choices(centers, cum_weights=cum_weights, k=n)
+    top = disk_size - 1
+    return array('i', (min(top, max(0, c + rng.randint(-spread, spread))) for c in picks))
+
+
+def sequential_burst_requests(n, disk_size, seed=0, burst=64):
+    """Runs of consecutive cylinders starting at random positions, like a file being streamed."""
+    rng = random.Random(seed)
+    out = array('i')
+    while len(out) < n:
+        start = rng.randrange(disk_size)
+        length = min(rng.randint(1, burst), n - len(out))
+        out.extend((start + i) % disk_size for i in range(length))
+    return out
+
+
+def bimodal_requests(n, disk_size, seed=0, spread=0.08):
+    """Two clusters around 25% and 75% of the disk."""
+    rng = random.Random(seed)
+    sigma = disk_size * spread
+    top = disk_size - 1
+    centers = (disk_size * 0.25, disk_size * 0.75)
+    return array('i', (min(top, max(0, int(rng.gauss(centers[rng.random() < 0.5], sigma))))
+                       for _ in range(n)))
+
+
+PATTERNS = {
+    'uniform': uniform_requests,
+    'zipf': zipf_hotspot_requests,
+    'burst': sequential_burst_requests,
+    'bimodal': bimodal_requests,
+}
+
+ALGORITHMS = {
+    'FCFS': lambda req, head, disk_size: fcfs_disk_schedule(req, head),
+    'SCAN': lambda req, head, disk_size: scan_disk_scheduling(req, head, disk_size, 'right'),
+    'C-SCAN': lambda req, head, disk_size: cscan_disk_scheduling(req, head, disk_size),
+    'SSTF': lambda req, head, disk_size: sstf_disk_scheduling(req, head),
+    'LOOK': lambda req, head, disk_size: look_disk_scheduling(req, head, 'right'),
+    'C-LOOK': lambda req, head, disk_size: clook_disk_scheduling(req, head),
+}
+
+# --- Measurement ---
+
+def measure(func, requests, head, disk_size, repeat=1):
+    """Best wall time over `repeat` runs, then one extra run under tracemalloc for peak memory."""
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _, seek_time = func(requests, head, disk_size)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func(requests, head, disk_size)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'wall_time_s': best,
+        'requests_per_s': len(requests) / best if best > 0 else None,
+        'peak_memory_bytes': peak,
+        'head_movement': int(seek_time),
+    }
+
+
+def run_benchmarks(patterns, sizes, algorithms, disk_size=10000, seed=0, repeat=1,
+                   as_list=False, log=print):
+    results = []
+    head = disk_size // 2
+    for pattern in patterns:
+        for n in sizes:
+            requests = PATTERNS[pattern](n, disk_size, seed)
+            if as_list:
+                requests = requests.tolist()
+            for name in algorithms:
+                row = {'pattern': pattern, 'size': n, 'algorithm': name,
+                       'input': 'list' if as_list else 'array'}
+                row.update(measure(ALGORITHMS[name], requests, head, disk_size, repeat))
+                results.append(row)
+                log(f"  {pattern:<8} {n:>9} {name:<7} {row['wall_time_s']:>10.4f}s "
+                    f"{row['requests_per_s'] or 0:>14,.0f} req/s "
+                    f"{row['peak_memory_bytes'] / 1024:>12,.1f} KiB  seek={row['head_movement']}")
+    return results
+
+
+def compare(baseline, results, tolerance=0.2):
+    """Rows that got slower than the baseline by more than `tolerance`, or whose head movement changed."""
+    key = lambda r: (r['pattern'], r['size'], r['algorithm'], r['input'])
+    old = {key(r): r for r in baseline['results']}
+    regressions = []
+    for row in results:
+        before = old.get(key(row))
+        if before is None:
+            continue
+        if row['head_movement'] != before['head_movement']:
+            regressions.append((row, before, 'head movement changed'))
+        elif row['wall_time_s'] > before['wall_time_s'] * (1 + tolerance):
+            regressions.append((row, before, f"{row['wall_time_s'] / before['wall_time_s']:.2f}x slower"))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the disk scheduling algorithms.")
+    parser.add_argument('--patterns', nargs='+', choices=sorted(PATTERNS), default=list(PATTERNS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(SIZES))
+    parser.add_argument('--algorithms', nargs='+', choices=list(ALGORITHMS), default=list(ALGORITHMS))
+    parser.add_argument('--disk-size', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per case; the best is kept")
+    parser.add_argument('--list', action='store_true', help="pass Python lists instead of array('i')")
+    parser.add_argument('--output', help="write the results as JSON to this file")
+    parser.add_argument('--baseline', help="JSON file from an earlier run to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    print("--- Disk Scheduling Benchmark ---")
+    results = run_benchmarks(args.patterns, args.sizes, args.algorithms, args.disk_size,
+                             args.seed, args.repeat, args.list)
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__ if np is not None else None,
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'disk_size': args.disk_size,
+            'seed': args.seed,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(json.load(f), results, args.tolerance)
+        for row, before, reason in regressions:
+            print(f"REGRESSION {row['pattern']} n={row['size']} {row['algorithm']}: {reason}")
+        if regressions:
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
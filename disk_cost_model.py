@@ -0,0 +1,163 @@
+# Latency model for the disk schedulers.
+#
+# Total cylinder distance says little about how long requests actually wait.
+# DiskCostModel turns head movement into time (seek curve + rotational delay
+# + transfer time), and DiskScheduler uses it to advance its clock. The helpers
+# below replay a timestamped trace and summarize the response times.
+#
+# Usage:
+#   python disk_cost_model.py --requests 5000 --rate 0.08 --rpm 7200 --seek-curve sqrt
+
+import argparse
+import math
+import random
+import sys
+
+from online_disk_code import DiskScheduler
+
+
+class DiskCostModel:
+    """Service-time model for one request, in the same unit as arrival times.
+
+    seek_curve 'linear': settle_time + seek_per_cylinder * d
+    seek_curve 'sqrt':   settle_time + seek_per_cylinder * sqrt(d)
+    A zero-distance move costs nothing.
+
+    With rpm set, the platter position is a function of the clock. A request
+    waits for its sector to rotate under the head, then transfers
+    transfer_sectors sectors. A request without a sector pays half a
+    rotation, the expected delay. With rpm=None rotation and transfer are
+    free. The defaults therefore charge one time unit per cylinder, the plain
+    "seek time" the simulator reported before.
+    """
+
+    SEEK_CURVES = ('linear', 'sqrt')
+
+    def __init__(self, seek_curve='linear', seek_per_cylinder=1.0, settle_time=0.0,
+                 rpm=None, sectors_per_track=63, transfer_sectors=1):
+        if seek_curve not in self.SEEK_CURVES:
+            raise ValueError(f"Unknown seek curve: {seek_curve}")
+        self.seek_curve = seek_curve
+        self.seek_per_cylinder = seek_per_cylinder
+        self.settle_time = settle_time
+        self.rpm = rpm
+        self.sectors_per_track = sectors_per_track
+        self.transfer_sectors = transfer_sectors
+        # Time for one revolution, in milliseconds
+        self.rotation_time = 60000.0 / rpm if rpm else 0.0
+
+    def seek_time(self, distance):
+        if distance == 0:
+            return 0
+        if self.seek_curve == 'sqrt':
+            return self.settle_time + self.seek_per_cylinder * math.sqrt(distance)
+        return self.settle_time + self.seek_per_cylinder * distance
+
+    def rotational_delay(self, now, sector=None):
+        if not self.rotation_time:
+            return 0
+        if sector is None:
+            return self.rotation_time / 2
+        per_sector = self.rotation_time / self.sectors_per_track
+        under_head = (now % self.rotation_time) / per_sector
+        return ((sector - under_head) % self.sectors_per_track) * per_sector
+
+    def transfer_time(self):
+        if not self.rotation_time:
+            return 0
+        return self.transfer_sectors * self.rotation_time / self.sectors_per_track
+
+
+def _percentile(ordered, p):
+    # Nearest-rank percentile of an already sorted list
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def latency_report(events):
+    """Summarize service events from DiskScheduler.next()/replay()."""
+    responses = []
+    service_total = 0
+    seek_total = 0
+    first_arrival = None
+    last_finish = 0
+    for finish_time, cylinder, arrival_time, distance, service_time in events:
+        responses.append(finish_time - arrival_time)
+        service_total += service_time
+        seek_total += distance
+        if first_arrival is None or arrival_time < first_arrival:
+            first_arrival = arrival_time
+        last_finish = max(last_finish, finish_time)
+
+    n = len(responses)
+    responses.sort()
+    elapsed = last_finish - first_arrival if n else 0
+    return {
+        'requests': n,
+        'head_movement': seek_total,
+        'mean_service': service_total / n if n else None,
+        'mean_response': sum(responses) / n if n else None,
+        'p95_response': _percentile(responses, 95),
+        'p99_response': _percentile(responses, 99),
+        'max_response': responses[-1] if n else None,
+        'throughput': n / elapsed if elapsed > 0 else None,
+    }
+
+
+def compare_latency(trace, head, disk_size, cost_model=None,
+                    algorithms=('FCFS', 'SCAN', 'C-SCAN', 'SSTF'), direction='right'):
+    """Replay the same trace through each algorithm and return {algorithm: latency_report}.
+    trace is a sequence of (arrival_time, cylinder) or (arrival_time, cylinder, sector)."""
+    results = {}
+    for algorithm in algorithms:
+        scheduler = DiskScheduler(algorithm, head, disk_size, direction, cost_model=cost_model)
+        results[algorithm] = latency_report(scheduler.replay(trace))
+    return results
+
+
+def poisson_trace(n, disk_size, rate, sectors_per_track=63, seed=0):
+    """n uniform requests with exponential inter-arrival times (rate = requests per time unit)."""
+    rng = random.Random(seed)
+    now = 0.0
+    trace = []
+    for _ in range(n):
+        now += rng.expovariate(rate)
+        trace.append((now, rng.randrange(disk_size), rng.randrange(sectors_per_track)))
+    return trace
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare disk schedulers on response time.")
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--rate', type=float, default=0.08, help="arrivals per millisecond")
+    parser.add_argument('--disk-size', type=int, default=5000)
+    parser.add_argument('--head', type=int, default=0)
+    parser.add_argument('--seek-curve', choices=DiskCostModel.SEEK_CURVES, default='sqrt')
+    parser.add_argument('--seek-per-cylinder', type=float, default=0.1, help="ms per cylinder (or per sqrt cylinder)")
+    parser.add_argument('--settle-time', type=float, default=1.0, help="ms added to every non-zero seek")
+    parser.add_argument('--rpm', type=int, default=7200)
+    parser.add_argument('--sectors-per-track', type=int, default=63)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.requests < 1:
+        parser.error("--requests must be at least 1")
+    if args.rate <= 0:
+        parser.error("--rate must be positive")
+
+    model = DiskCostModel(args.seek_curve, args.seek_per_cylinder, args.settle_time,
+                          args.rpm, args.sectors_per_track)
+    trace = poisson_trace(args.requests, args.disk_size, args.rate, args.sectors_per_track, args.seed)
+    results = compare_latency(trace, args.head, args.disk_size, model)
+
+    print(f"--- Disk latency ({args.requests} requests, {args.rate}/ms, {args.rpm} rpm, {args.seek_curve} seek) ---")
+    print(f"{'algorithm':<8} {'mean svc':>9} {'mean resp':>10} {'p95':>10} {'p99':>10} {'req/ms':>8} {'movement':>10}")
+    for algorithm, r in results.items():
+        print(f"{algorithm:<8} {r['mean_service']:>9.2f} {r['mean_response']:>10.2f} {r['p95_response']:>10.2f} "
+              f"{r['p99_response']:>10.2f} {r['throughput']:>8.4f} {r['head_movement']:>10}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
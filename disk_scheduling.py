@@ -1,5 +1,61 @@
 # This file groups the disk scheduling algorithms for easy import.
+# Plain lists go through the original Python loops; numpy arrays and
+# array('i') traces are routed to the vectorized engine when numpy is available.
+# SSTF, LOOK and C-LOOK walk the requests one at a time, so arrays are turned
+# into a list of Python ints for them first (no fixed-width overflow, and much
+# faster to index than numpy scalars). This lets the columns of a
+# trace_format.TraceFile be passed to any of the functions directly.
+# None of the functions modify the requests passed in, and the sorting ones
+# take presorted=True when the caller already holds the requests in ascending order.
 
-from fcfs_code import fcfs_disk_schedule
-from scan_code import scan_disk_scheduling
-from cscan_code import cscan_disk_scheduling
\ No newline at end of file
+from array import array
+
+from fcfs_code import fcfs_disk_schedule as _fcfs_list
+from scan_code import scan_disk_scheduling as _scan_list
+from cscan_code import cscan_disk_scheduling as _cscan_list
+from sstf_code import sstf_disk_scheduling as _sstf_list
+from look_code import look_disk_scheduling as _look_list
+from clook_code import clook_disk_scheduling as _clook_list
+from vectorized_disk_code import (np, fcfs_disk_schedule_np,
+                                  scan_disk_scheduling_np, cscan_disk_scheduling_np)
+from online_disk_code import DiskScheduler
+
+
+def _is_array(requests):
+    if isinstance(requests, array):
+        return True
+    return np is not None and isinstance(requests, np.ndarray)
+
+
+def fcfs_disk_schedule(requests, head):
+    if _is_array(requests) and np is not None:
+        return fcfs_disk_schedule_np(requests, head)
+    return _fcfs_list(requests, head)
+
+
+def scan_disk_scheduling(requests, head, disk_size, direction, presorted=False):
+    if _is_array(requests) and np is not None:
+        return scan_disk_scheduling_np(requests, head, disk_size, direction, presorted)
+    return _scan_list(requests, head, disk_size, direction, presorted)
+
+
+def cscan_disk_scheduling(requests, head, disk_size, presorted=False):
+    if _is_array(requests) and np is not None:
+        return cscan_disk_scheduling_np(requests, head, disk_size, presorted)
+    return _cscan_list(requests, head, disk_size, presorted)
+
+
+def _as_list(requests):
+    return requests.tolist() if _is_array(requests) else requests
+
+
+def sstf_disk_scheduling(requests, head, presorted=False):
+    return _sstf_list(_as_list(requests), head, presorted)
+
+
+def look_disk_scheduling(requests, head, direction, presorted=False):
+    return _look_list(_as_list(requests), head, direction, presorted)
+
+
+def clook_disk_scheduling(requests, head, presorted=False):
+    return _clook_list(_as_list(requests), head, presorted)
\ No newline at end of file
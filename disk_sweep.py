@@ -0,0 +1,162 @@
+# What-if sweep: run the disk scheduling algorithms over a grid of head
+# positions, disk sizes and sweep directions for one request trace.
+#
+# The grid is fanned out over a ProcessPoolExecutor. The trace (and a sorted
+# copy of it) is placed in shared memory once, and every worker attaches to it
+# instead of receiving a pickled copy with each task.
+#
+# Usage:
+#   python disk_sweep.py --requests "176, 79, 34, 60, 92, 11, 41, 114" --heads 0:200:10 --disk-sizes 200 400
+#   python disk_sweep.py --pattern zipf --size 1000000 --heads 0:10000:500 --output sweep.csv
+
+import argparse
+import csv
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from disk_benchmark import PATTERNS
+from disk_scheduling import (np, fcfs_disk_schedule, scan_disk_scheduling, cscan_disk_scheduling,
+                             sstf_disk_scheduling, look_disk_scheduling, clook_disk_scheduling)
+
+# Algorithms that take a direction get one row per direction, the rest get direction None
+DIRECTIONAL = ('SCAN', 'LOOK')
+ALGORITHMS = ('FCFS', 'SCAN', 'C-SCAN', 'SSTF', 'LOOK', 'C-LOOK')
+COLUMNS = ('algorithm', 'head', 'disk_size', 'direction', 'seek_time')
+
+# --- Worker side ---
+
+_shm = None
+_trace = None    # requests in arrival order
+_sorted = None   # the same requests in ascending order
+
+
+def _attach(name, count):
+    """Pool initializer: map the shared request block into this worker."""
+    global _shm, _trace, _sorted
+    _shm = shared_memory.SharedMemory(name=name)
+    view = _shm.buf.cast('i')
+    _trace, _sorted = view[:count], view[count:2 * count]
+
+
+def _arrays():
+    # The numpy engine gets zero-copy ndarrays; the index-walking algorithms
+    # keep the memoryviews, which yield plain Python ints.
+    if np is not None:
+        return np.frombuffer(_trace, dtype=np.intc), np.frombuffer(_sorted, dtype=np.intc)
+    return _trace, _sorted
+
+
+def _run_case(case):
+    algorithm, head, disk_size, direction = case
+    trace, ordered = _arrays()
+    if algorithm == 'FCFS':
+        _, seek = fcfs_disk_schedule(trace, head)
+    elif algorithm == 'SCAN':
+        _, seek = scan_disk_scheduling(ordered, head, disk_size, direction, presorted=True)
+    elif algorithm == 'C-SCAN':
+        _, seek = cscan_disk_scheduling(ordered, head, disk_size, presorted=True)
+    elif algorithm == 'SSTF':
+        _, seek = sstf_disk_scheduling(_sorted, head, presorted=True)
+    elif algorithm == 'LOOK':
+        _, seek = look_disk_scheduling(_sorted, head, direction, presorted=True)
+    else:
+        _, seek = clook_disk_scheduling(_sorted, head, presorted=True)
+    return {'algorithm': algorithm, 'head': head, 'disk_size': disk_size,
+            'direction': direction, 'seek_time': int(seek)}
+
+# --- Parent side ---
+
+def build_grid(heads, disk_sizes, directions=('left', 'right'), algorithms=ALGORITHMS):
+    grid = []
+    for disk_size in disk_sizes:
+        for head in heads:
+            if not 0 <= head < disk_size:
+                continue
+            for algorithm in algorithms:
+                for direction in (directions if algorithm in DIRECTIONAL else (None,)):
+                    grid.append((algorithm, head, disk_size, direction))
+    return grid
+
+
+def sweep(requests, heads, disk_sizes, directions=('left', 'right'), algorithms=ALGORITHMS,
+          workers=None, chunksize=None):
+    """Run every (algorithm, head, disk_size, direction) combination and return
+    a list of rows with the keys in COLUMNS, in grid order."""
+    requests = array('i', requests)
+    if requests and max(requests) >= min(disk_sizes):
+        raise ValueError("Every request must be smaller than the smallest disk size")
+    grid = build_grid(heads, disk_sizes, directions, algorithms)
+    if not grid:
+        return []
+
+    count = len(requests)
+    shm = shared_memory.SharedMemory(create=True, size=max(requests.itemsize, 2 * count * requests.itemsize))
+    try:
+        view = shm.buf.cast('i')
+        view[:count] = requests
+        view[count:2 * count] = array('i', sorted(requests))
+        view.release()
+
+        workers = workers or os.cpu_count() or 1
+        if chunksize is None:
+            chunksize = max(1, len(grid) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(shm.name, count)) as pool:
+            return list(pool.map(_run_case, grid, chunksize=chunksize))
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _parse_range(text):
+    # "0:200:10" -> range(0, 200, 10); "5,50,120" -> [5, 50, 120]
+    if ':' in text:
+        return list(range(*(int(p) for p in text.split(':'))))
+    return [int(p) for p in text.split(',')]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep disk scheduling algorithms over heads and disk sizes.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--requests', help="comma-separated cylinders, e.g. '98, 183, 37'")
+    source.add_argument('--pattern', choices=sorted(PATTERNS), help="synthetic workload from disk_benchmark")
+    parser.add_argument('--size', type=int, default=10000, help="number of requests for --pattern")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--heads', required=True, help="start:stop:step or a comma-separated list")
+    parser.add_argument('--disk-sizes', nargs='+', type=int, default=[200])
+    parser.add_argument('--directions', nargs='+', choices=('left', 'right'), default=['left', 'right'])
+    parser.add_argument('--algorithms', nargs='+', choices=ALGORITHMS, default=list(ALGORITHMS))
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', help="write the table as CSV to this file")
+    args = parser.parse_args(argv)
+
+    if args.requests is not None:
+        try:
+            requests = [int(r.strip()) for r in args.requests.split(',')]
+        except ValueError:
+            parser.error(f"--requests must be a comma-separated list of cylinders, got {args.requests!r}")
+    else:
+        requests = PATTERNS[args.pattern](args.size, min(args.disk_sizes), args.seed)
+
+    rows = sweep(requests, _parse_range(args.heads), args.disk_sizes, args.directions,
+                 args.algorithms, args.workers)
+
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"{len(rows)} rows written to {args.output}")
+    else:
+        print(f"{'algorithm':<8} {'head':>6} {'disk_size':>9} {'direction':<9} {'seek_time':>12}")
+        for row in rows:
+            print(f"{row['algorithm']:<8} {row['head']:>6} {row['disk_size']:>9} "
+                  f"{row['direction'] or '-':<9} {row['seek_time']:>12}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
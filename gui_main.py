@@ -4,12 +4,16 @@ import subprocess
 import sys
 import os
 import io
+import queue
+import threading
 from contextlib import redirect_stdout
 
 # Import the logic from your existing files
 try:
     from disk_scheduling import fcfs_disk_schedule, scan_disk_scheduling, cscan_disk_scheduling
     from memory_management import PagingSystem, SegmentationSystem, MemoryAllocator
+    from trace_format import parse_requests
+    from Group5_Multithreading_and_Synchronization import run_demo
 except ImportError as e:
     messagebox.showerror("Error", f"Could not find required files: {e}\n\nPlease make sure all .py files are in the same directory.")
     sys.exit(1)
@@ -90,24 +94,50 @@ class OS_Simulator_GUI(tk.Tk):
         output_box = scrolledtext.ScrolledText(win, wrap=tk.WORD, width=80, height=25, font=("Courier New", 9))
         output_box.pack(padx=10, pady=10, fill='both', expand=True)
 
-        def run_demo(demo_name):
+        # Demos run in-process on a worker thread; their output lines come back
+        # through a queue that the Tk thread drains in batches.
+        DONE = object()
+        current = {'lines': None}
+
+        def worker(demo_name, lines):
+            try:
+                run_demo(demo_name, out=lines.put)
+                lines.put(f"\n\n--- {demo_name} Complete ---")
+            except Exception as e:
+                lines.put(f"ERROR:\n{e}")
+            lines.put(DONE)
+
+        def drain(lines):
+            if lines is not current['lines']:
+                return # a newer run took over the box
+            batch = []
+            done = False
+            while True:
+                try:
+                    line = lines.get_nowait()
+                except queue.Empty:
+                    break
+                if line is DONE:
+                    done = True
+                    break
+                batch.append(line)
+            if batch:
+                output_box.insert(tk.END, "\n".join(batch) + "\n")
+                output_box.see(tk.END)
+            if not done:
+                win.after(30, drain, lines)
+
+        def start_demo(demo_name):
             output_box.delete('1.0', tk.END)
             output_box.insert(tk.END, f"--- Running {demo_name} ---\n\n")
-            try:
-                # Run the script as a subprocess and capture its output
-                cmd = ["python", "Group5_Multithreading_and_Synchronization.py", demo_name]
-                result = subprocess.run(cmd, capture_output=True, text=True, check=True, encoding='utf-8')
-                output_box.insert(tk.END, result.stdout)
-                output_box.insert(tk.END, f"\n\n--- {demo_name} Complete ---")
-            except subprocess.CalledProcessError as e:
-                output_box.insert(tk.END, f"ERROR:\n{e.stderr}\n{e.stdout}")
-            except FileNotFoundError:
-                output_box.insert(tk.END, "Error: 'Group5_Multithreading_and_Synchronization.py' not found.")
-
-        ttk.Button(btn_frame, text="Race Condition", command=lambda: run_demo("race")).pack(side='left', padx=5)
-        ttk.Button(btn_frame, text="Mutex Demo", command=lambda: run_demo("mutex_demo")).pack(side='left', padx=5)
-        ttk.Button(btn_frame, text="Semaphore Demo", command=lambda: run_demo("semaphore_demo")).pack(side='left', padx=5)
-        ttk.Button(btn_frame, text="Producer-Consumer", command=lambda: run_demo("prod_cons")).pack(side='left', padx=5)
+            lines = current['lines'] = queue.Queue()
+            threading.Thread(target=worker, args=(demo_name, lines), daemon=True).start()
+            drain(lines)
+
+        ttk.Button(btn_frame, text="Race Condition", command=lambda: start_demo("race")).pack(side='left', padx=5)
+        ttk.Button(btn_frame, text="Mutex Demo", command=lambda: start_demo("mutex_demo")).pack(side='left', padx=5)
+        ttk.Button(btn_frame, text="Semaphore Demo", command=lambda: start_demo("semaphore_demo")).pack(side='left', padx=5)
+        ttk.Button(btn_frame, text="Producer-Consumer", command=lambda: start_demo("prod_cons")).pack(side='left', padx=5)
 
     def open_disk_scheduler(self):
         """Opens the disk scheduling input window."""
@@ -146,7 +176,7 @@ class OS_Simulator_GUI(tk.Tk):
 
         def run_alg(alg_name):
             try:
-                requests = [int(r.strip()) for r in ent_requests.get().split(',')]
+                requests = parse_requests(ent_requests.get())  # a list, or the path of a disk trace file
                 head = int(ent_head.get())
                 disk_size = int(ent_disk_size.get())
                 
@@ -154,12 +184,12 @@ class OS_Simulator_GUI(tk.Tk):
                 output_box.insert(tk.END, f"--- Running {alg_name} ---\n")
                 
                 if alg_name == "FCFS":
-                    seq, seek = fcfs_disk_schedule(requests.copy(), head)
+                    seq, seek = fcfs_disk_schedule(requests, head)
                 elif alg_name == "SCAN":
                     direction = scan_dir.get()
-                    seq, seek = scan_disk_scheduling(requests.copy(), head, disk_size, direction)
+                    seq, seek = scan_disk_scheduling(requests, head, disk_size, direction)
                 elif alg_name == "C-SCAN":
-                    seq, seek = cscan_disk_scheduling(requests.copy(), head, disk_size)
+                    seq, seek = cscan_disk_scheduling(requests, head, disk_size)
                 
                 output_box.insert(tk.END, f"Seek Sequence: {seq}\n")
                 output_box.insert(tk.END, f"Total Seek Time: {seek}\n")
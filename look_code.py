@@ -0,0 +1,25 @@
+from bisect import bisect_left
+
+
+def look_disk_scheduling(requests, head, direction, presorted=False):
+    # Like SCAN, but the head turns around at the last request instead of the disk edge
+    ordered = requests if presorted else sorted(requests)
+    split = bisect_left(ordered, head)  # ordered[:split] < head <= ordered[split:]
+
+    if direction == "left":
+        sweeps = (range(split - 1, -1, -1), range(split, len(ordered)))
+    else:
+        sweeps = (range(split, len(ordered)), range(split - 1, -1, -1))
+
+    seek_sequence = []
+    seek_time = 0
+    current = head
+
+    for sweep in sweeps:
+        for i in sweep:
+            r = ordered[i]
+            seek_sequence.append(r)
+            seek_time += abs(current - r)
+            current = r
+
+    return seek_sequence, seek_time
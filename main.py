@@ -1,8 +1,11 @@
 import subprocess
 import shlex
 import sys
-from disk_scheduling import fcfs_disk_schedule, scan_disk_scheduling, cscan_disk_scheduling
-from memory_management import PagingSystem, SegmentationSystem, MemoryAllocator
+from disk_scheduling import (fcfs_disk_schedule, scan_disk_scheduling, cscan_disk_scheduling,
+                             sstf_disk_scheduling, look_disk_scheduling, clook_disk_scheduling)
+from memory_management import PagingSystem, SegmentationSystem, MemoryAllocator, BuddyAllocator, SlabAllocator
+from trace_format import parse_requests
+from Group5_Multithreading_and_Synchronization import run_demo
 
 # --- Helper Functions for User Input ---
 
@@ -15,33 +18,37 @@ def get_int(prompt):
             print("Invalid input. Please enter a number.")
 
 def get_requests(prompt):
-    """Get a list of disk requests from the user."""
+    """Get a list of disk requests from the user, typed in or read from a disk trace file."""
     while True:
         try:
             requests_str = input(prompt)
-            return [int(r.strip()) for r in requests_str.split(',')]
+            return parse_requests(requests_str)
         except ValueError:
-            print("Invalid input. Please enter a list of numbers separated by commas (e.g., 98, 183, 37, 122)")
+            print("Invalid input. Please enter a list of numbers separated by commas (e.g., 98, 183, 37, 122) or a disk trace file.")
 
 # --- Sub-Menu: Disk Scheduling ---
 
 def run_disk_scheduling():
     """Menu for running disk scheduling algorithms."""
     print("\n--- 💿 Disk Scheduling Simulator ---")
-    requests = get_requests("Enter disk requests (comma-separated): ")
+    requests = get_requests("Enter disk requests (comma-separated) or a trace file: ")
     head = get_int("Enter initial head position: ")
     disk_size = get_int("Enter total disk size (e.g., 200): ")
+    sorted_requests = sorted(requests)  # sorted once, reused by every sorting algorithm run
 
     while True:
         print("\nDisk Algorithms:")
         print("  1. FCFS (First-Come, First-Served)")
         print("  2. SCAN")
         print("  3. C-SCAN (Circular SCAN)")
-        print("  4. Back to Main Menu")
+        print("  4. SSTF (Shortest Seek Time First)")
+        print("  5. LOOK")
+        print("  6. C-LOOK (Circular LOOK)")
+        print("  7. Back to Main Menu")
         choice = input("Choose an algorithm: ")
 
         if choice == '1':
-            seq, seek = fcfs_disk_schedule(requests.copy(), head)
+            seq, seek = fcfs_disk_schedule(requests, head)
             print(f"  [FCFS] Sequence: {seq}")
             print(f"  [FCFS] Total Seek Time: {seek}")
         
@@ -50,22 +57,47 @@ def run_disk_scheduling():
             if direction not in ['left', 'right']:
                 print("  Invalid direction. Defaulting to 'right'.")
                 direction = 'right'
-            seq, seek = scan_disk_scheduling(requests.copy(), head, disk_size, direction)
+            seq, seek = scan_disk_scheduling(sorted_requests, head, disk_size, direction, presorted=True)
             print(f"  [SCAN] Sequence: {seq}")
             print(f"  [SCAN] Total Seek Time: {seek}")
             
         elif choice == '3':
-            seq, seek = cscan_disk_scheduling(requests.copy(), head, disk_size)
+            seq, seek = cscan_disk_scheduling(sorted_requests, head, disk_size, presorted=True)
             print(f"  [C-SCAN] Sequence: {seq}")
             print(f"  [C-SCAN] Total Seek Time: {seek}")
-            
+
         elif choice == '4':
+            seq, seek = sstf_disk_scheduling(sorted_requests, head, presorted=True)
+            print(f"  [SSTF] Sequence: {seq}")
+            print(f"  [SSTF] Total Seek Time: {seek}")
+
+        elif choice == '5':
+            direction = input("  Enter direction ('left' or 'right'): ").lower()
+            if direction not in ['left', 'right']:
+                print("  Invalid direction. Defaulting to 'right'.")
+                direction = 'right'
+            seq, seek = look_disk_scheduling(sorted_requests, head, direction, presorted=True)
+            print(f"  [LOOK] Sequence: {seq}")
+            print(f"  [LOOK] Total Seek Time: {seek}")
+
+        elif choice == '6':
+            seq, seek = clook_disk_scheduling(sorted_requests, head, presorted=True)
+            print(f"  [C-LOOK] Sequence: {seq}")
+            print(f"  [C-LOOK] Total Seek Time: {seek}")
+            
+        elif choice == '7':
             break
         else:
             print("Invalid choice. Please try again.")
 
 # --- Sub-Menu: Memory Management ---
 
+ALLOCATORS = {
+    '1': ("Contiguous", MemoryAllocator),
+    '2': ("Buddy", BuddyAllocator),
+    '3': ("Slab", SlabAllocator),
+}
+
 def run_memory_management():
     """Menu for memory management simulations from the PDF."""
     print("\n--- 🧠 Memory Management Simulator ---")
@@ -80,7 +112,8 @@ def run_memory_management():
     
     while True:
         print("\nMemory Management Techniques:")
-        print("  (A) Contiguous Allocation")
+        print("  (A) Memory Allocation")
+        print("    0. Switch Allocator (Contiguous / Buddy / Slab)")
         print("    1. Allocate (First Fit)")
         print("    2. Allocate (Best Fit)")
         print("    3. Free Memory")
@@ -88,23 +121,36 @@ def run_memory_management():
         print("  (B) Paging")
         print("    5. Allocate Process (Paging)")
         print("    6. Translate Address (Paging)")
+        print("    7. Free Process (Paging)")
         print("  (C) Segmentation")
-        print("    7. Allocate Segment")
-        print("    8. Translate Address (Segmentation)")
+        print("    8. Allocate Segment")
+        print("    9. Translate Address (Segmentation)")
+        print("    10. Find Segment of Physical Address")
         print("  (D) Exit")
-        print("    9. Back to Main Menu")
+        print("    11. Back to Main Menu")
         
         choice = input("Choose an option: ")
         
         try:
-            if choice == '1':
+            if choice == '0':
+                kind = input("  Allocator (1=Contiguous, 2=Buddy, 3=Slab): ")
+                if kind not in ALLOCATORS:
+                    print("  Invalid allocator.")
+                    continue
+                name, cls = ALLOCATORS[kind]
+                allocator = cls(total_mem)
+                print(f"  Switched to {name} allocator ({total_mem} units).")
+            elif choice == '1':
                 pid = input("  Enter Process ID: ")
                 size = get_int("  Enter memory size to allocate: ")
-                allocator.first_fit(pid, size)
+                allocator.allocate(pid, size)  # first fit for the contiguous allocator
             elif choice == '2':
                 pid = input("  Enter Process ID: ")
                 size = get_int("  Enter memory size to allocate: ")
-                allocator.best_fit(pid, size)
+                if isinstance(allocator, MemoryAllocator):
+                    allocator.best_fit(pid, size)
+                else:
+                    allocator.allocate(pid, size)  # buddy/slab have a single placement policy
             elif choice == '3':
                 pid = input("  Enter Process ID to free: ")
                 allocator.free(pid)
@@ -119,17 +165,23 @@ def run_memory_management():
                 addr = get_int("  Enter logical address: ")
                 paging.translate_address(pid, addr)
             elif choice == '7':
+                pid = input("  Enter Process ID to free: ")
+                paging.free_process(pid)
+            elif choice == '8':
                 pid = input("  Enter Process ID: ")
                 seg_num = get_int("  Enter segment number: ")
                 base = get_int("  Enter base address: ")
                 limit = get_int("  Enter segment limit: ")
                 segmentation.allocate_segment(pid, seg_num, base, limit)
-            elif choice == '8':
+            elif choice == '9':
                 pid = input("  Enter Process ID: ")
                 seg_num = get_int("  Enter segment number: ")
                 offset = get_int("  Enter offset: ")
                 segmentation.translate_address(pid, seg_num, offset)
-            elif choice == '9':
+            elif choice == '10':
+                addr = get_int("  Enter physical address: ")
+                segmentation.reverse_translate(addr)
+            elif choice == '11':
                 break
             else:
                 print("Invalid choice.")
@@ -152,18 +204,17 @@ def run_thread_sync_demos():
         print("  6. Back to Main Menu")
         choice = input("Choose a demo: ")
         
-        cmd = ["python", "Group5_Multithreading_and_Synchronization.py"]
-        
+        # The demos run in this process, no interpreter start per run
         if choice == '1':
-            subprocess.run(cmd + ["race"])
+            run_demo("race")
         elif choice == '2':
-            subprocess.run(cmd + ["mutex_demo"])
+            run_demo("mutex_demo")
         elif choice == '3':
-            subprocess.run(cmd + ["semaphore_demo"])
+            run_demo("semaphore_demo")
         elif choice == '4':
-            subprocess.run(cmd + ["prod_cons"])
+            run_demo("prod_cons")
         elif choice == '5':
-            subprocess.run(cmd + ["all"])
+            run_demo("all")
         elif choice == '6':
             break
         else:
@@ -197,7 +248,7 @@ def main_menu():
         print("\nMain Menu:")
         print("  1. Process & System Call Simulator (fork, exec, wait)")
         print("  2. Thread Synchronization Demos (Mutex, Semaphore)")
-        print("  3. Disk Scheduling Algorithms (FCFS, SCAN, C-SCAN)")
+        print("  3. Disk Scheduling Algorithms (FCFS, SCAN, C-SCAN, SSTF, LOOK, C-LOOK)")
         print("  4. Memory Management Techniques (Paging, Segmentation)")
         print("  5. Exit")
         
@@ -1,52 +1,603 @@
 # This code is transcribed from 'Os code member 3-5.pdf' [cite: 1]
 
+import bisect
+import heapq
+import random
+from array import array
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, translate_trace falls back to a Python loop
+    np = None
+
+from page_replacement import make_policy
+from page_tables import make_page_table
+
 # --- Member 3 - Paging Implementation --- [cite: 2]
+class TLB:
+    """Set-associative TLB caching (process_id, page_number) -> frame_number.
+
+    entries are split into entries // associativity sets (associativity=None
+    means fully associative) and a page maps to set page_number % sets. Each
+    set evicts with the chosen policy: 'lru' and 'fifo' keep an OrderedDict,
+    'clock' sweeps a hand over per-way reference bits, 'random' picks any way.
+
+    hit_time and memory_time (in ns) feed effective_access_time(), the average
+    cost of one memory access including translation.
+    """
+    POLICIES = ('lru', 'fifo', 'random', 'clock')
+
+    def __init__(self, entries=16, associativity=None, policy='lru', hit_time=1, memory_time=100, seed=None):
+        ways = associativity or entries
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown TLB policy: {policy}")
+        if entries <= 0 or ways <= 0 or entries % ways:
+            raise ValueError("TLB entries must be a positive multiple of the associativity")
+        self.entries = entries
+        self.ways = ways
+        self.num_sets = entries // ways
+        self.policy = policy
+        self.hit_time = hit_time
+        self.memory_time = memory_time
+        self.hits = 0
+        self.misses = 0
+        self._rng = random.Random(seed)
+        if policy in ('lru', 'fifo'):
+            self._sets = [OrderedDict() for _ in range(self.num_sets)] # key -> frame, oldest first
+        else:
+            # key -> way, plus per-way key, frame and reference bit, and the clock hand
+            self._sets = [({}, [None] * ways, [0] * ways, bytearray(ways), [0]) for _ in range(self.num_sets)]
+
+    def lookup(self, process_id, page_number):
+        """Frame number on a hit, None on a miss."""
+        key = (process_id, page_number)
+        entry_set = self._sets[page_number % self.num_sets]
+        if self.policy in ('lru', 'fifo'):
+            frame = entry_set.get(key)
+            if frame is not None and self.policy == 'lru':
+                entry_set.move_to_end(key)
+        else:
+            index, _, frames, ref, _ = entry_set
+            way = index.get(key)
+            frame = None
+            if way is not None:
+                frame = frames[way]
+                ref[way] = 1
+        if frame is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return frame
+
+    def insert(self, process_id, page_number, frame_number):
+        key = (process_id, page_number)
+        entry_set = self._sets[page_number % self.num_sets]
+        if self.policy in ('lru', 'fifo'):
+            if key not in entry_set and len(entry_set) >= self.ways:
+                entry_set.popitem(last=False)
+            entry_set[key] = frame_number
+            return
+        index, keys, frames, ref, hand = entry_set
+        way = index.get(key)
+        if way is None:
+            if len(index) < self.ways:
+                way = keys.index(None)
+            elif self.policy == 'random':
+                way = self._rng.randrange(self.ways)
+            else:
+                while ref[hand[0]]: # second chance for recently used ways
+                    ref[hand[0]] = 0
+                    hand[0] = (hand[0] + 1) % self.ways
+                way = hand[0]
+                hand[0] = (way + 1) % self.ways
+            if keys[way] is not None:
+                del index[keys[way]]
+            index[key] = way
+            keys[way] = key
+        frames[way] = frame_number
+        ref[way] = 1
+
+    def invalidate(self, process_id, page_number=None):
+        """Drop one page of a process, or every entry of the process when page_number is None."""
+        sets = self._sets if page_number is None else [self._sets[page_number % self.num_sets]]
+        for entry_set in sets:
+            index = entry_set if self.policy in ('lru', 'fifo') else entry_set[0]
+            stale = [key for key in index if key[0] == process_id and page_number in (None, key[1])]
+            for key in stale:
+                if self.policy in ('lru', 'fifo'):
+                    del entry_set[key]
+                else:
+                    way = index.pop(key)
+                    entry_set[1][way] = None
+                    entry_set[3][way] = 0
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def effective_access_time(self, page_table_refs=1):
+        """Average ns per access: a hit costs the TLB plus one memory access, a miss
+        also pays page_table_refs memory accesses to walk the page table."""
+        h = self.hit_rate()
+        return (self.hit_time + self.memory_time
+                + (1 - h) * page_table_refs * self.memory_time)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hit_rate(),
+                'effective_access_time': self.effective_access_time()}
+
 class PagingSystem:
-    def __init__(self, num_frames, page_size): # [cite: 5]
+    """Paging with a page table per process and a shared frame table.
+
+    By default allocate_process maps every page up front and a missing page is
+    reported as a fault. With replacement set (a name from
+    page_replacement.REPLACEMENT_POLICIES or a policy instance) pages are
+    loaded on first use instead, and a fault with no free frame evicts the
+    page the policy picks, from any process.
+
+    page_table selects the structure behind the translations: 'flat',
+    'two-level', 'four-level' or 'inverted' (see page_tables.py), sized for
+    address_bits-bit virtual addresses.
+    """
+
+    def __init__(self, num_frames, page_size, tlb=None, replacement=None,
+                 page_table='flat', address_bits=32): # [cite: 5]
         self.num_frames = num_frames # [cite: 6]
         self.page_size = page_size # [cite: 7]
-        self.page_table = {} # [cite: 8] # process_id -> {page_number: frame_number} [cite: 9]
-        self.frames = [None] * num_frames # [cite: 10, 11]
+        self.tlb = tlb # optional TLB consulted before the page table
+        self.replacement = None if replacement is None else make_policy(replacement)
+        self.process_pages = {} # process_id -> number of pages in its address space
+        self.references = {} # process_id -> translations requested
+        self.page_faults = {} # process_id -> faults taken
+        # [cite: 8] process_id -> {page_number: frame_number} [cite: 9], through a page_tables backend
+        self.page_table = make_page_table(page_table, address_bits, page_size, num_frames)
+        self.max_pages = 1 << self.page_table.vpn_bits # pages in one virtual address space
+        self._sparse_pages = {} # process_id -> pages added with map_page beyond process_pages
+        # Frame table [cite: 10, 11]: owner slot and page number per frame, -1 when free.
+        # Process ids are mapped to small integer slots so the table stays two flat arrays.
+        self.frame_owner = array('i', [-1]) * num_frames
+        self.frame_page = array('q', [-1]) * num_frames
+        self._free_frames = array('i', range(num_frames - 1, -1, -1)) # stack, lowest frame on top
+        self._owner_slot = {} # process_id -> slot
+        self._slot_owner = [] # slot -> process_id (None once released)
+        self._free_slots = []
+
+    @property
+    def frames(self):
+        """Frame table as a list of (process_id, page_number) or None, like the original list."""
+        return [None if slot < 0 else (self._slot_owner[slot], page)
+                for slot, page in zip(self.frame_owner, self.frame_page)]
+
+    def free_frame_count(self):
+        return len(self._free_frames)
+
+    def _claim_slot(self, process_id):
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._slot_owner[slot] = process_id
+        else:
+            slot = len(self._slot_owner)
+            self._slot_owner.append(process_id)
+        self._owner_slot[process_id] = slot
+        return slot
 
     def allocate_process(self, process_id, num_pages): # [cite: 12]
         print(f"Allocating {num_pages} pages for process {process_id}...") # [cite: 13]
-        free_frames = [i for i, f in enumerate(self.frames) if f is None]
-        if len(free_frames) < num_pages:
+        if process_id in self.page_table:
+            print(f"Error: Process {process_id} is already allocated!")
+            return
+        if num_pages > self.max_pages:
+            print("Error: Process is larger than the virtual address space!")
+            return
+        if self.replacement is not None:
+            self._claim_slot(process_id)
+            self.page_table.create(process_id)
+            self.process_pages[process_id] = num_pages
+            print(f"Process {process_id} allocated successfully! Pages are loaded on demand.")
+            return
+        if len(self._free_frames) < num_pages:
             print("Error: Not enough frames available!") # [cite: 14]
             return
             
-        self.page_table[process_id] = {} # [cite: 15]
+        slot = self._claim_slot(process_id)
+        self.process_pages[process_id] = num_pages
+        self.page_table.create(process_id) # [cite: 15]
         for i in range(num_pages): # [cite: 16]
-            frame = free_frames[i] # [cite: 17]
-            self.frames[frame] = (process_id, i) # [cite: 18]
-            self.page_table[process_id][i] = frame
+            frame = self._free_frames.pop() # [cite: 17]
+            self.frame_owner[frame] = slot # [cite: 18]
+            self.frame_page[frame] = i
+            self.page_table.map(process_id, i, frame)
         print(f"Process {process_id} allocated successfully!") # [cite: 19]
 
+    def free_process(self, process_id):
+        if process_id not in self.page_table:
+            print("Error: Process not found!")
+            return
+        table = self.page_table.destroy(process_id)
+        del self.process_pages[process_id]
+        self._sparse_pages.pop(process_id, None)
+        if self.replacement is not None:
+            for page_number in table:
+                self.replacement.remove((process_id, page_number))
+        for frame in sorted(table.values(), reverse=True): # lowest frames end up on top of the stack
+            self.frame_owner[frame] = -1
+            self.frame_page[frame] = -1
+            self._free_frames.append(frame)
+        slot = self._owner_slot.pop(process_id)
+        self._slot_owner[slot] = None
+        self._free_slots.append(slot)
+        if self.tlb is not None:
+            self.tlb.invalidate(process_id)
+        print(f"Process {process_id} freed {len(table)} frames.")
+
+    def _lookup(self, process_id, page_number):
+        # TLB first, then the page table; a page table hit is cached in the TLB.
+        # Under demand paging a valid page that is not resident gets loaded.
+        self.references[process_id] = self.references.get(process_id, 0) + 1
+        tlb = self.tlb
+        replacement = self.replacement
+        frame_number = None if tlb is None else tlb.lookup(process_id, page_number)
+        if frame_number is None:
+            frame_number = self.page_table.lookup(process_id, page_number)
+            if frame_number is None:
+                if replacement is None:
+                    self.page_faults[process_id] = self.page_faults.get(process_id, 0) + 1
+                    return None
+                frame_number = self._load_page(process_id, page_number)
+                if frame_number is None:
+                    return None
+            else:
+                if replacement is not None:
+                    replacement.access((process_id, page_number))
+            if tlb is not None:
+                tlb.insert(process_id, page_number, frame_number)
+        elif replacement is not None:
+            replacement.access((process_id, page_number))
+        if replacement is not None and replacement.trims:
+            self._trim(process_id)
+        return frame_number
+
+    def _is_valid_page(self, process_id, page_number):
+        return (0 <= page_number < self.process_pages.get(process_id, 0)
+                or page_number in self._sparse_pages.get(process_id, ()))
+
+    def _unmap(self, process_id, page_number):
+        frame = self.page_table.unmap(process_id, page_number)
+        if self.tlb is not None:
+            self.tlb.invalidate(process_id, page_number)
+        return frame
+
+    def _load_page(self, process_id, page_number):
+        # Page fault under demand paging: take a free frame or evict the policy's victim
+        if not self._is_valid_page(process_id, page_number):
+            return None
+        self.page_faults[process_id] = self.page_faults.get(process_id, 0) + 1
+        if self._free_frames:
+            frame = self._free_frames.pop()
+        else:
+            frame = self._unmap(*self.replacement.victim())
+        self.frame_owner[frame] = self._owner_slot[process_id]
+        self.frame_page[frame] = page_number
+        self.page_table.map(process_id, page_number, frame)
+        self.replacement.insert((process_id, page_number))
+        return frame
+
+    def _trim(self, process_id):
+        # Working-set policy: release the pages that left the working set
+        for key in self.replacement.trim(process_id):
+            frame = self._unmap(*key)
+            self.frame_owner[frame] = -1
+            self.frame_page[frame] = -1
+            self._free_frames.append(frame)
+
     def translate_address(self, process_id, logical_address): # [cite: 20]
         page_number = logical_address // self.page_size
         offset = logical_address % self.page_size
         
-        if process_id not in self.page_table or page_number not in self.page_table[process_id]: # [cite: 21]
-            print(f"Page fault! Page {page_number} of process {process_id} not in frame.") # [cite: 21]
+        faults = self.page_faults.get(process_id, 0)
+        frame_number = self._lookup(process_id, page_number) # [cite: 22]
+        if frame_number is None: # [cite: 21]
+            if self.replacement is not None:
+                print(f"Error: Page {page_number} is outside the address space of process {process_id}!")
+            else:
+                print(f"Page fault! Page {page_number} of process {process_id} not in frame.") # [cite: 21]
             return None
+        if self.page_faults.get(process_id, 0) > faults:
+            print(f"Page fault! Page {page_number} of process {process_id} loaded into frame {frame_number}.")
             
-        frame_number = self.page_table[process_id][page_number] # [cite: 22]
         physical_address = frame_number * self.page_size + offset # [cite: 23]
         print(f"Logical address {logical_address} -> Physical address {physical_address}") # [cite: 24]
         return physical_address # [cite: 25]
 
+    def translate_many(self, process_id, logical_addresses):
+        """Translate a whole address trace without printing. Returns a list of
+        physical addresses, with None for every page fault."""
+        page_size = self.page_size
+        lookup = self._lookup
+        results = []
+        append = results.append
+        for logical_address in logical_addresses:
+            page_number, offset = divmod(logical_address, page_size)
+            frame_number = lookup(process_id, page_number)
+            append(None if frame_number is None else frame_number * page_size + offset)
+        return results
+
+    def map_page(self, process_id, page_number):
+        """Map one page anywhere in the virtual address space, registering the
+        process if needed. Sparse address spaces are built this way without
+        allocating the pages in between. Under demand paging the page is only
+        made valid and gets a frame on first use. Returns the frame or None."""
+        if not 0 <= page_number < self.max_pages:
+            print(f"Error: Page {page_number} is outside the virtual address space!")
+            return None
+        if self._is_valid_page(process_id, page_number):
+            print(f"Error: Page {page_number} of process {process_id} is already mapped!")
+            return None
+        if self.replacement is None and not self._free_frames:
+            print("Error: Not enough frames available!")
+            return None
+        if process_id not in self.page_table:
+            self._claim_slot(process_id)
+            self.page_table.create(process_id)
+            self.process_pages[process_id] = 0
+        self._sparse_pages.setdefault(process_id, set()).add(page_number)
+        if self.replacement is not None:
+            print(f"Page {page_number} of process {process_id} mapped, loaded on first use.")
+            return None
+        frame = self._free_frames.pop()
+        self.frame_owner[frame] = self._owner_slot[process_id]
+        self.frame_page[frame] = page_number
+        self.page_table.map(process_id, page_number, frame)
+        print(f"Page {page_number} of process {process_id} mapped to frame {frame}.")
+        return frame
+
+    def dense_page_table(self, process_id):
+        """Page table of one process as a flat array indexed by page number, -1 where not resident."""
+        table = self.page_table.mappings(process_id)
+        size = max(self.process_pages.get(process_id, 0), max(table, default=-1) + 1)
+        dense = array('q', [-1]) * size
+        for page_number, frame_number in table.items():
+            dense[page_number] = frame_number
+        return dense
+
+    def translate_trace(self, process_id, logical_addresses):
+        """Translate a whole address trace at once, without printing.
+
+        Returns (physical_addresses, faults): physical addresses are -1 where
+        the page is not resident, and faults is the matching boolean mask. With
+        numpy both are arrays computed by gathering from dense_page_table(), or
+        for a sparse address space by a binary search over the mapped pages;
+        otherwise lists. The TLB and the replacement policy are bypassed, so no
+        page is loaded, and the demand-paging counters behind fault_stats() are
+        left alone.
+        """
+        page_size = self.page_size
+        table = self.page_table.mappings(process_id)
+        if np is not None:
+            addresses = np.asarray(logical_addresses, dtype=np.int64)
+            pages, offsets = np.divmod(addresses, page_size)
+            frames = np.full(addresses.shape, -1, dtype=np.int64)
+            span = max(self.process_pages.get(process_id, 0), max(table, default=-1) + 1)
+            if span <= 4 * len(table) + 4096:
+                dense = self.dense_page_table(process_id)
+                dense = np.frombuffer(dense, dtype=np.int64) if len(dense) else np.empty(0, dtype=np.int64)
+                in_range = (pages >= 0) & (pages < dense.size)
+                frames[in_range] = dense[pages[in_range]]
+            elif table:
+                mapped = np.fromiter(sorted(table), dtype=np.int64, count=len(table))
+                targets = np.fromiter((table[p] for p in mapped.tolist()), dtype=np.int64, count=len(table))
+                index = np.minimum(np.searchsorted(mapped, pages), mapped.size - 1)
+                found = mapped[index] == pages
+                frames[found] = targets[index[found]]
+            faults = frames < 0
+            physical = np.where(faults, -1, frames * page_size + offsets)
+        else:
+            physical, faults = [], []
+            for logical_address in logical_addresses:
+                page_number, offset = divmod(logical_address, page_size)
+                frame_number = table.get(page_number)
+                physical.append(-1 if frame_number is None else frame_number * page_size + offset)
+                faults.append(frame_number is None)
+        return physical, faults
+
+    def page_table_stats(self):
+        """Footprint of the page-table structure and its memory references per translation.
+        With a TLB, effective_access_time charges those references on every miss."""
+        stats = {'structure': self.page_table.name,
+                 'footprint_bytes': self.page_table.footprint(),
+                 'refs_per_translation': self.page_table.refs_per_translation()}
+        if self.tlb is not None:
+            stats['effective_access_time'] = self.tlb.effective_access_time(
+                stats['refs_per_translation'] or 1)
+        return stats
+
+    def run_trace(self, trace):
+        """Replay (process_id, logical_address) references without printing and
+        return fault_stats(). A policy with prepare() (Optimal) is first given
+        the whole reference string."""
+        page_size = self.page_size
+        pages = [(process_id, logical_address // page_size) for process_id, logical_address in trace]
+        if hasattr(self.replacement, 'prepare'):
+            self.replacement.prepare([key for key in pages if self._is_valid_page(*key)])
+        lookup = self._lookup
+        for process_id, page_number in pages:
+            lookup(process_id, page_number)
+        return self.fault_stats()
+
+    def fault_stats(self):
+        """{process_id: {'references', 'page_faults', 'fault_rate'}} since the system was created."""
+        return {process_id: {'references': count,
+                             'page_faults': self.page_faults.get(process_id, 0),
+                             'fault_rate': self.page_faults.get(process_id, 0) / count}
+                for process_id, count in self.references.items()}
+
+    def print_fault_stats(self):
+        policy = self.replacement.name if self.replacement is not None else 'none'
+        print(f"\n--- Page Faults (replacement: {policy}) ---")
+        for process_id, stats in self.fault_stats().items():
+            print(f"Process {process_id}: {stats['page_faults']} faults / {stats['references']} references "
+                  f"({stats['fault_rate'] * 100:.2f}%)")
+
 # --- Member 4 - Segmentation Implementation --- [cite: 26]
+class _IntervalIndex:
+    """Disjoint [start, end) intervals with an owner each, ordered by start.
+
+    Intervals are kept in sorted chunks of up to 2 * CHUNK entries, a B-tree
+    with a single level: a binary search over the chunk minimums picks the
+    chunk and a second one inside it picks the interval. Lookups cost
+    O(log n) and an insert or delete only shifts entries within one chunk, so
+    hundreds of thousands of segments stay fast.
+    """
+
+    CHUNK = 512
+
+    def __init__(self):
+        self._mins = [] # first start of every chunk
+        self._starts = [] # per chunk: array('q') of starts
+        self._ends = [] # per chunk: array('q') of ends
+        self._owners = [] # per chunk: list of owners
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for starts, ends, owners in zip(self._starts, self._ends, self._owners):
+            yield from zip(starts, ends, owners)
+
+    def _last_at_or_before(self, point):
+        # (chunk, index) of the last interval starting at or before point, or None
+        c = bisect.bisect_right(self._mins, point) - 1
+        if c < 0:
+            return None
+        return c, bisect.bisect_right(self._starts[c], point) - 1
+
+    def _entry(self, c, i):
+        return self._starts[c][i], self._ends[c][i], self._owners[c][i]
+
+    def containing(self, point):
+        """(start, end, owner) of the interval holding point, or None."""
+        found = self._last_at_or_before(point)
+        if found is None or self._ends[found[0]][found[1]] <= point:
+            return None
+        return self._entry(*found)
+
+    def overlapping(self, start, end):
+        """(start, end, owner) of an interval overlapping [start, end), or None."""
+        found = self._last_at_or_before(start)
+        if found is None:
+            c, i = 0, 0
+        else:
+            c, i = found
+            if self._ends[c][i] > start:
+                return self._entry(c, i)
+            i += 1
+            if i == len(self._starts[c]):
+                c, i = c + 1, 0
+        if c < len(self._starts) and self._starts[c][i] < end:
+            return self._entry(c, i)
+        return None
+
+    def insert(self, start, end, owner):
+        if not self._starts:
+            self._mins.append(start)
+            self._starts.append(array('q'))
+            self._ends.append(array('q'))
+            self._owners.append([])
+        c = max(0, bisect.bisect_right(self._mins, start) - 1)
+        starts = self._starts[c]
+        i = bisect.bisect_left(starts, start)
+        starts.insert(i, start)
+        self._ends[c].insert(i, end)
+        self._owners[c].insert(i, owner)
+        self._mins[c] = starts[0]
+        self._count += 1
+        if len(starts) > 2 * self.CHUNK: # split the chunk in two
+            half = self.CHUNK
+            self._starts.insert(c + 1, starts[half:])
+            self._ends.insert(c + 1, self._ends[c][half:])
+            self._owners.insert(c + 1, self._owners[c][half:])
+            self._mins.insert(c + 1, starts[half])
+            del starts[half:]
+            del self._ends[c][half:]
+            del self._owners[c][half:]
+
+    def remove(self, start):
+        c = bisect.bisect_right(self._mins, start) - 1
+        starts = self._starts[c]
+        i = bisect.bisect_left(starts, start)
+        del starts[i]
+        del self._ends[c][i]
+        del self._owners[c][i]
+        self._count -= 1
+        if starts:
+            self._mins[c] = starts[0]
+        else:
+            del self._mins[c], self._starts[c], self._ends[c], self._owners[c]
+
+
 class SegmentationSystem:
+    """Segment tables per process, plus an index of physical memory.
+
+    Segments never overlap, so physical memory is indexed as disjoint
+    [base, base + limit) intervals (_IntervalIndex). Rejecting an overlapping
+    segment and finding the segment that holds a physical address (reverse
+    translation) are both O(log n) searches.
+    """
+
     def __init__(self): # [cite: 29]
         self.segment_table = {} # process_id -> {segment_number: (base, limit)} [cite: 30]
-        self.memory = {} # [cite: 30]
+        self.memory = _IntervalIndex() # [cite: 30] physical memory: (base, end, (process_id, segment_number))
 
     def allocate_segment(self, process_id, segment_number, base, limit): # [cite: 31]
+        if base < 0 or limit <= 0:
+            print("Error: Segment base must be non-negative and limit positive!")
+            return
+        old = self.segment_table.get(process_id, {}).get(segment_number)
+        if old is not None: # reallocating a segment replaces it
+            self.memory.remove(old[0])
+        overlap = self.memory.overlapping(base, base + limit)
+        if overlap is not None:
+            if old is not None:
+                self.memory.insert(old[0], old[0] + old[1], (process_id, segment_number))
+            start, end, (owner_pid, owner_segment) = overlap
+            print(f"Error: Overlaps segment {owner_segment} of process {owner_pid} at [{start}, {end})!")
+            return
+        self.memory.insert(base, base + limit, (process_id, segment_number))
         if process_id not in self.segment_table: # [cite: 32]
             self.segment_table[process_id] = {} # [cite: 33]
         self.segment_table[process_id][segment_number] = (base, limit) # [cite: 34]
         print(f"Allocated segment {segment_number} for process {process_id}: base={base}, limit={limit}") # [cite: 35]
 
+    def free_segment(self, process_id, segment_number):
+        segments = self.segment_table.get(process_id, {})
+        if segment_number not in segments:
+            print("Error: Invalid segment number!")
+            return
+        base, limit = segments.pop(segment_number)
+        if not segments:
+            del self.segment_table[process_id]
+        self.memory.remove(base)
+        print(f"Freed segment {segment_number} of process {process_id}.")
+
+    def owner_of(self, physical_address):
+        """(process_id, segment_number, offset) of the segment holding physical_address, or None."""
+        found = self.memory.containing(physical_address)
+        if found is None:
+            return None
+        base, _, (process_id, segment_number) = found
+        return process_id, segment_number, physical_address - base
+
+    def reverse_translate(self, physical_address):
+        owner = self.owner_of(physical_address)
+        if owner is None:
+            print(f"Physical address {physical_address} is not in any segment.")
+            return None
+        process_id, segment_number, offset = owner
+        print(f"Physical address {physical_address} -> Process {process_id}, Segment {segment_number}, Offset {offset}")
+        return owner
+
     def translate_address(self, process_id, segment_number, offset): # [cite: 36]
         if process_id not in self.segment_table or segment_number not in self.segment_table[process_id]: # [cite: 37]
             print("Error: Invalid segment number!") # [cite: 37]
@@ -62,45 +613,227 @@ class SegmentationSystem:
         print(f"Logical address (Segment {segment_number}, Offset {offset}) -> Physical address {physical_address}") # [cite: 46]
         return physical_address # [cite: 46]
 
+    def translate_trace(self, process_id, segment_numbers, offsets):
+        """Translate parallel sequences of segment numbers and offsets without printing.
+
+        Returns (physical_addresses, faults) like PagingSystem.translate_trace:
+        -1 and True for an unknown segment or an offset outside [0, limit).
+        With numpy the segment table is laid out as dense base/limit arrays
+        and the whole trace is checked and translated in a few array operations.
+        """
+        table = self.segment_table.get(process_id, {})
+        if np is not None and all(type(n) is int and n >= 0 for n in table):
+            size = max(table, default=-1) + 1
+            bases = np.zeros(size, dtype=np.int64)
+            limits = np.zeros(size, dtype=np.int64) # a missing segment has limit 0, so every offset faults
+            for segment_number, (base, limit) in table.items():
+                bases[segment_number] = base
+                limits[segment_number] = limit
+            segments = np.asarray(segment_numbers, dtype=np.int64)
+            offsets = np.asarray(offsets, dtype=np.int64)
+            known = (segments >= 0) & (segments < size)
+            index = np.where(known, segments, 0)
+            faults = ~known | (offsets < 0) | (offsets >= limits[index] if size else True)
+            physical = np.where(faults, -1, (bases[index] if size else 0) + offsets)
+            return physical, faults
+
+        physical, faults = [], []
+        for segment_number, offset in zip(segment_numbers, offsets):
+            base, limit = table.get(segment_number, (0, 0))
+            fault = not 0 <= offset < limit
+            physical.append(-1 if fault else base + offset)
+            faults.append(fault)
+        return physical, faults
+
 # --- Member 5 - Memory Allocation / Deallocation --- [cite: 47]
+class _MaxTree:
+    """Sparse max segment tree over positions [0, capacity).
+
+    Nodes use heap numbering and only non-zero nodes are stored, so memory
+    grows with the number of occupied positions rather than with capacity.
+    Updates and searches cost O(log capacity).
+    """
+    def __init__(self, capacity):
+        self.size = 1
+        while self.size < capacity:
+            self.size <<= 1
+        self.nodes = {}
+
+    def set(self, pos, value):
+        nodes = self.nodes
+        get = nodes.get
+        i = pos + self.size
+        if value:
+            nodes[i] = value
+        else:
+            nodes.pop(i, None)
+        while i > 1:
+            sibling = get(i ^ 1, 0)
+            if sibling > value:
+                value = sibling
+            i >>= 1
+            if get(i, 0) == value:
+                break  # nothing above this node changes
+            if value:
+                nodes[i] = value
+            else:
+                del nodes[i]
+
+    def first_at_least(self, value, lo=0):
+        """Leftmost position >= lo holding at least `value`, or None."""
+        if lo:
+            return self._find(1, 0, self.size, lo, value)
+        get = self.nodes.get
+        if get(1, 0) < value:
+            return None
+        i = 1
+        while i < self.size:
+            i *= 2
+            if get(i, 0) < value:
+                i += 1
+        return i - self.size
+
+    def _find(self, i, node_lo, node_hi, lo, value):
+        if node_hi <= lo or self.nodes.get(i, 0) < value:
+            return None
+        if node_hi - node_lo == 1:
+            return node_lo
+        mid = (node_lo + node_hi) // 2
+        found = self._find(2 * i, node_lo, mid, lo, value)
+        if found is None:
+            found = self._find(2 * i + 1, mid, node_hi, lo, value)
+        return found
+
 class MemoryAllocator:
-    def __init__(self, total_memory): # [cite: 50]
+    # Free blocks are indexed two ways:
+    #   _by_addr: max tree keyed by start address -> block size (first fit)
+    #   _by_size: tree keyed by block size marking which sizes exist, plus a
+    #             min-heap of start addresses per size (best fit, lowest address on ties)
+    # _block_ends maps each free block's end address back to its start, so the
+    # neighbours of a freed block are found with two dict lookups.
+    #
+    # coalesce='immediate' merges a freed block with free neighbours right away.
+    # coalesce='deferred' only records the block; merging happens in one pass
+    # in coalesce(), which also runs before an allocation would otherwise fail.
+    COALESCE_MODES = ('immediate', 'deferred')
+
+    def __init__(self, total_memory, coalesce='immediate'): # [cite: 50]
+        if coalesce not in self.COALESCE_MODES:
+            raise ValueError(f"Unknown coalescing mode: {coalesce}")
         self.total_memory = total_memory # [cite: 51, 52]
-        self.free_blocks = [(0, total_memory)] # (start, size) [cite: 53]
+        self.coalesce_mode = coalesce
         self.allocated = {} # process_id -> (start, size) [cite: 53, 55]
+        self._blocks = {} # start -> size of every free block
+        self._block_ends = {} # start + size -> start
+        self._free_total = 0
+        self._pending_merges = False
+        self._by_addr = _MaxTree(total_memory)
+        self._by_size = _MaxTree(total_memory + 1)
+        self._size_starts = {} # size -> heap of starts (may hold stale entries)
+        self._size_count = {} # size -> number of free blocks of that size
+        if total_memory > 0:
+            self._add_block(0, total_memory) # (start, size) [cite: 53]
+
+    @property
+    def free_blocks(self):
+        """Free blocks as (start, size), in address order."""
+        return sorted(self._blocks.items())
+
+    def _add_block(self, start, size):
+        self._blocks[start] = size
+        self._block_ends[start + size] = start
+        self._free_total += size
+        self._by_addr.set(start, size)
+        heapq.heappush(self._size_starts.setdefault(size, []), start)
+        self._size_count[size] = self._size_count.get(size, 0) + 1
+        if self._size_count[size] == 1:
+            self._by_size.set(size, 1)
+
+    def _remove_block(self, start):
+        size = self._blocks.pop(start)
+        del self._block_ends[start + size]
+        self._free_total -= size
+        self._by_addr.set(start, 0)
+        self._size_count[size] -= 1
+        if not self._size_count[size]:
+            del self._size_count[size]
+            del self._size_starts[size]
+            self._by_size.set(size, 0)
+        return size
+
+    def _lowest_start(self, size):
+        # Drop heap entries for blocks that were removed since they were pushed
+        starts = self._size_starts[size]
+        while self._blocks.get(starts[0]) != size:
+            heapq.heappop(starts)
+        return starts[0]
+
+    def _take(self, process_id, start, size):
+        free_size = self._remove_block(start)
+        self.allocated[process_id] = (start, size) # [cite: 58]
+        if free_size != size: # [cite: 59]
+            self._add_block(start + size, free_size - size) # [cite: 61, 62]
+
+    def _release(self, start, size):
+        if self.coalesce_mode == 'deferred':
+            self._add_block(start, size)
+            self._pending_merges = True
+            return
+        before = self._block_ends.get(start)
+        if before is not None:
+            size += self._remove_block(before)
+            start = before
+        if start + size in self._blocks:
+            size += self._remove_block(start + size)
+        self._add_block(start, size)
+
+    def coalesce(self):
+        """Merge every run of adjacent free blocks (one pass in address order)."""
+        if not self._pending_merges:
+            return
+        self._pending_merges = False
+        for start in sorted(self._blocks):
+            if start not in self._blocks:
+                continue  # already merged into the block before it
+            size = self._blocks[start]
+            end = start + size
+            if end not in self._blocks:
+                continue
+            self._remove_block(start)
+            while end in self._blocks:
+                size += self._remove_block(end)
+                end = start + size
+            self._add_block(start, size)
+
+    def _first_fit_start(self, size):
+        start = self._by_addr.first_at_least(max(size, 1)) # [cite: 56, 57]
+        if start is None and self._pending_merges:
+            self.coalesce()
+            start = self._by_addr.first_at_least(max(size, 1))
+        return start
+
+    def _best_fit_size(self, size):
+        best_size = self._by_size.first_at_least(1, lo=max(size, 1)) # [cite: 66, 67, 68, 69]
+        if best_size is None and self._pending_merges:
+            self.coalesce()
+            best_size = self._by_size.first_at_least(1, lo=max(size, 1))
+        return best_size
 
     def first_fit(self, process_id, size): # [cite: 54]
-        for i, (start, free_size) in enumerate(self.free_blocks): # [cite: 56]
-            if free_size >= size: # [cite: 57]
-                self.allocated[process_id] = (start, size) # [cite: 58]
-                if free_size == size: # [cite: 59]
-                    self.free_blocks.pop(i) # [cite: 60]
-                else:
-                    self.free_blocks[i] = (start + size, free_size - size) # [cite: 61, 62]
-                print(f"Process {process_id} allocated {size} units using First Fit at {start}") # [cite: 63]
-                return
-        print("Error: Not enough memory (First Fit).") # [cite: 64]
+        start = self._first_fit_start(size)
+        if start is None:
+            print("Error: Not enough memory (First Fit).") # [cite: 64]
+            return
+        self._take(process_id, start, size)
+        print(f"Process {process_id} allocated {size} units using First Fit at {start}") # [cite: 63]
 
     def best_fit(self, process_id, size): # [cite: 65]
-        best_index = -1 # [cite: 66]
-        best_size = float('inf') # [cite: 67] corrected from None
-        
-        for i, (start, free_size) in enumerate(self.free_blocks): # [cite: 68]
-            if free_size >= size and free_size < best_size: # [cite: 69]
-                best_index, best_size = i, free_size
-                
-        if best_index == -1: # [cite: 70]
+        best_size = self._best_fit_size(size)
+        if best_size is None: # [cite: 70]
             print("Error: Not enough memory (Best Fit).") # [cite: 71]
             return
-            
-        start, free_size = self.free_blocks[best_index] # [cite: 72]
-        self.allocated[process_id] = (start, size) # [cite: 72]
-        
-        if free_size == size: # [cite: 72]
-            self.free_blocks.pop(best_index) # [cite: 74]
-        else:
-            self.free_blocks[best_index] = (start + size, free_size - size) # [cite: 73, 75, 76]
-        
+        start = self._lowest_start(best_size) # [cite: 72]
+        self._take(process_id, start, size)
         print(f"Process {process_id} allocated {size} units using Best Fit at {start}") # [cite: 77]
 
     def free(self, process_id): # [cite: 78]
@@ -109,11 +842,25 @@ class MemoryAllocator:
             return
             
         start, size = self.allocated.pop(process_id) # [cite: 81]
-        self.free_blocks.append((start, size)) # [cite: 82]
-        self.free_blocks.sort() # [cite: 83]
-        # (Merging adjacent free blocks would be a good addition here)
+        if size > 0:
+            self._release(start, size) # [cite: 82, 83]
         print(f"Process {process_id} deallocated memory block from {start} to {start + size}.") # [cite: 84]
 
+    def allocate(self, process_id, size):
+        """Common entry point shared with BuddyAllocator and SlabAllocator (first fit)."""
+        self.first_fit(process_id, size)
+
+    def fragmentation(self):
+        """Free-space statistics. external_fragmentation is 1 - largest/free:
+        0 when all free memory is one block, close to 1 when it is in slivers."""
+        largest = self._by_addr.nodes.get(1, 0)
+        return {
+            'free_memory': self._free_total,
+            'free_blocks': len(self._blocks),
+            'largest_free_block': largest,
+            'external_fragmentation': 1 - largest / self._free_total if self._free_total else 0.0,
+        }
+
     def print_map(self):
         """Helper function to show current memory state."""
         print("\n--- Memory Map ---")
@@ -125,8 +872,211 @@ class MemoryAllocator:
             print(f"  PID {pid}: Start {start}, Size {size}")
         
         print("Free Blocks:")
-        if not self.free_blocks:
+        free_blocks = self.free_blocks
+        if not free_blocks:
             print("  (None - Full)")
-        for (start, size) in self.free_blocks:
+        for (start, size) in free_blocks:
             print(f"  Free: Start {start}, Size {size}")
+        stats = self.fragmentation()
+        print(f"Largest Free Block: {stats['largest_free_block']}")
+        print(f"External Fragmentation: {stats['external_fragmentation']:.2%}")
+        print("-" * 18)
+
+class BuddyAllocator:
+    """Power-of-two buddy allocator.
+
+    Memory is handed out in aligned blocks of 2^k * min_block units. Each order
+    k has a free bitmap (bytearray indexed by block number) and a min-heap of
+    candidate block numbers, so allocation, splitting and merging take
+    O(log N) steps. Requests are rounded up to the next power of two.
+    """
+    def __init__(self, total_memory, min_block=1):
+        self.total_memory = total_memory
+        self.min_block = min_block
+        self.allocated = {} # process_id -> (start, size)
+        self._orders = {} # process_id -> order of its block
+        units = total_memory // min_block
+        self.max_order = max(units.bit_length() - 1, 0)
+        self._free_bits = [bytearray((units >> k) + 1) for k in range(self.max_order + 1)]
+        self._free_heaps = [[] for _ in range(self.max_order + 1)] # may hold stale entries
+        # Cover [0, units) with the largest aligned power-of-two blocks that fit
+        unit = 0
+        while unit < units:
+            order = (units - unit).bit_length() - 1
+            if unit:
+                order = min(order, (unit & -unit).bit_length() - 1)
+            self._push_free(unit >> order, order)
+            unit += 1 << order
+
+    def _push_free(self, index, order):
+        self._free_bits[order][index] = 1
+        heapq.heappush(self._free_heaps[order], index)
+
+    def _pop_free(self, order):
+        heap, bits = self._free_heaps[order], self._free_bits[order]
+        while heap:
+            index = heapq.heappop(heap)
+            if bits[index]:
+                bits[index] = 0
+                return index
+        return None
+
+    def block_size(self, order):
+        return (1 << order) * self.min_block
+
+    def allocate(self, process_id, size):
+        units = max(1, -(-size // self.min_block))
+        order = (units - 1).bit_length()
+        for k in range(order, self.max_order + 1):
+            index = self._pop_free(k)
+            if index is not None:
+                break
+        else:
+            print("Error: Not enough memory (Buddy).")
+            return
+        while k > order: # split, keeping the lower half and freeing its buddy
+            k -= 1
+            index <<= 1
+            self._push_free(index + 1, k)
+        start = (index << order) * self.min_block
+        self.allocated[process_id] = (start, size)
+        self._orders[process_id] = order
+        print(f"Process {process_id} allocated {size} units using Buddy at {start} (block {self.block_size(order)})")
+
+    def free(self, process_id):
+        if process_id not in self.allocated:
+            print("Error: Process not found!")
+            return
+        start, size = self.allocated.pop(process_id)
+        order = self._orders.pop(process_id)
+        index = (start // self.min_block) >> order
+        while order < self.max_order and self._free_bits[order][index ^ 1]:
+            self._free_bits[order][index ^ 1] = 0 # buddy is free: merge upwards
+            index >>= 1
+            order += 1
+        self._push_free(index, order)
+        print(f"Process {process_id} deallocated memory block from {start} to {start + size}.")
+
+    @property
+    def free_blocks(self):
+        """Free blocks as (start, size), in address order."""
+        blocks = []
+        for order, heap in enumerate(self._free_heaps):
+            bits = self._free_bits[order]
+            for index in set(heap):
+                if bits[index]:
+                    blocks.append(((index << order) * self.min_block, self.block_size(order)))
+        return sorted(blocks)
+
+    def print_map(self):
+        print("\n--- Memory Map (Buddy) ---")
+        print(f"Total Memory: {self.total_memory}")
+        print("Allocated Blocks:")
+        if not self.allocated:
+            print("  (None)")
+        wasted = 0
+        for pid, (start, size) in self.allocated.items():
+            block = self.block_size(self._orders[pid])
+            wasted += block - size
+            print(f"  PID {pid}: Start {start}, Size {size} (block {block})")
+        print("Free Blocks:")
+        free_blocks = self.free_blocks
+        if not free_blocks:
+            print("  (None - Full)")
+        for (start, size) in free_blocks:
+            print(f"  Free: Start {start}, Size {size}")
+        print(f"Internal Fragmentation: {wasted} units")
+        print("-" * 18)
+
+class _Slab:
+    def __init__(self, start, object_size, capacity):
+        self.start = start
+        self.object_size = object_size
+        self.free_slots = list(range(capacity - 1, -1, -1)) # stack, lowest slot on top
+        self.in_use = 0
+
+class SlabAllocator:
+    """Slab (object-cache) allocator for small fixed-size objects.
+
+    Memory is cut into slabs of slab_size units. Each cache serves one object
+    size and keeps its partially used slabs; a slab holds a stack of free
+    object slots. Allocating takes a slot from a partial slab (or a fresh slab
+    from the pool) and freeing pushes it back, returning the slab to the pool
+    once it is empty. Both are O(1). A request uses the smallest object size
+    that fits it.
+    """
+    def __init__(self, total_memory, slab_size=128, object_sizes=(8, 16, 32, 64, 128)):
+        if any(size > slab_size for size in object_sizes):
+            raise ValueError("Object sizes cannot exceed the slab size")
+        self.total_memory = total_memory
+        self.slab_size = slab_size
+        self.object_sizes = sorted(object_sizes)
+        self.allocated = {} # process_id -> (start, size)
+        self._slots = {} # process_id -> (slab, slot)
+        self._partial = {size: {} for size in self.object_sizes} # object size -> {slab start: slab}
+        self._slabs = {size: 0 for size in self.object_sizes} # object size -> slabs in use
+        self._used = {size: 0 for size in self.object_sizes} # object size -> objects in use
+        num_slabs = total_memory // slab_size
+        self._free_slabs = [i * slab_size for i in range(num_slabs - 1, -1, -1)] # stack of slab starts
+        self.num_slabs = num_slabs
+
+    def allocate(self, process_id, size):
+        i = bisect.bisect_left(self.object_sizes, size)
+        if i == len(self.object_sizes):
+            print(f"Error: Object too large for slab caches (max {self.object_sizes[-1]}).")
+            return
+        object_size = self.object_sizes[i]
+        partial = self._partial[object_size]
+        if partial:
+            slab = next(iter(partial.values()))
+        elif self._free_slabs:
+            slab = _Slab(self._free_slabs.pop(), object_size, self.slab_size // object_size)
+            partial[slab.start] = slab
+            self._slabs[object_size] += 1
+        else:
+            print("Error: Not enough memory (Slab).")
+            return
+        slot = slab.free_slots.pop()
+        slab.in_use += 1
+        if not slab.free_slots:
+            del partial[slab.start] # slab is full
+        self._used[object_size] += 1
+        start = slab.start + slot * object_size
+        self.allocated[process_id] = (start, size)
+        self._slots[process_id] = (slab, slot)
+        print(f"Process {process_id} allocated {size} units using Slab at {start} (object {object_size})")
+
+    def free(self, process_id):
+        if process_id not in self.allocated:
+            print("Error: Process not found!")
+            return
+        start, size = self.allocated.pop(process_id)
+        slab, slot = self._slots.pop(process_id)
+        slab.free_slots.append(slot)
+        slab.in_use -= 1
+        self._used[slab.object_size] -= 1
+        partial = self._partial[slab.object_size]
+        if not slab.in_use:
+            partial.pop(slab.start, None) # empty slab goes back to the pool
+            self._free_slabs.append(slab.start)
+            self._slabs[slab.object_size] -= 1
+        elif slab.start not in partial:
+            partial[slab.start] = slab # was full, now has room again
+        print(f"Process {process_id} deallocated memory block from {start} to {start + size}.")
+
+    def print_map(self):
+        print("\n--- Memory Map (Slab) ---")
+        print(f"Total Memory: {self.total_memory} ({self.num_slabs} slabs of {self.slab_size})")
+        print("Allocated Blocks:")
+        if not self.allocated:
+            print("  (None)")
+        for pid, (start, size) in self.allocated.items():
+            slab, _ = self._slots[pid]
+            print(f"  PID {pid}: Start {start}, Size {size} (object {slab.object_size})")
+        print("Caches:")
+        for object_size in self.object_sizes:
+            capacity = self._slabs[object_size] * (self.slab_size // object_size)
+            print(f"  {object_size}-unit objects: {self._slabs[object_size]} slabs, "
+                  f"{self._used[object_size]}/{capacity} in use")
+        print(f"Free Slabs: {len(self._free_slabs)} of {self.num_slabs}")
         print("-" * 18)
\ No newline at end of file
@@ -0,0 +1,152 @@
+import heapq
+from collections import deque
+
+
+class DiskScheduler:
+    """Online disk scheduler: requests are submitted while the disk is serving.
+
+    FCFS keeps a plain queue. SSTF, SCAN and C-SCAN keep two heaps split at
+    the head (requests at or above it, requests below it), so submitting and
+    dispatching a request costs O(log n). Serving an empty queue returns None.
+
+    Head movement follows the batch functions: with every request submitted
+    up front, the total seek time matches fcfs_disk_schedule,
+    scan_disk_scheduling and cscan_disk_scheduling. The one exception is a
+    leftward SCAN with nothing queued above the head, which stops at its last
+    request instead of running on to cylinder 0.
+
+    Without a cost_model the clock advances one time unit per cylinder
+    travelled. With a DiskCostModel (disk_cost_model.py) the clock follows its
+    seek curve, rotational delay and transfer time.
+    """
+
+    ALGORITHMS = ('FCFS', 'SSTF', 'SCAN', 'C-SCAN')
+
+    def __init__(self, algorithm='FCFS', head=0, disk_size=200, direction='right', cost_model=None):
+        algorithm = algorithm.upper()
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f"Unknown disk algorithm: {algorithm}")
+        if direction not in ('left', 'right'):
+            raise ValueError(f"Direction must be 'left' or 'right', not {direction!r}")
+        self.algorithm = algorithm
+        self.head = head
+        self.disk_size = disk_size
+        self.direction = direction
+        self.cost_model = cost_model
+        self.time = 0
+        self.seek_time = 0
+        self._fifo = deque()  # FCFS: (cylinder, arrival_time, sector)
+        self._up = []         # min-heap of (cylinder, seq, arrival_time, sector) at or above the head
+        self._down = []       # SSTF/SCAN: max-heap (negated cylinder) below the head
+                              # C-SCAN: min-heap of requests waiting for the next sweep
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._fifo) + len(self._up) + len(self._down)
+
+    def submit(self, cylinder, arrival_time=None, sector=None):
+        """Queue a request. arrival_time defaults to the current clock; sector
+        only matters to a cost model with rotation."""
+        if arrival_time is None:
+            arrival_time = self.time
+        if self.algorithm == 'FCFS':
+            self._fifo.append((cylinder, arrival_time, sector))
+            return
+        self._seq += 1
+        if cylinder >= self.head:
+            heapq.heappush(self._up, (cylinder, self._seq, arrival_time, sector))
+        elif self.algorithm == 'C-SCAN':
+            heapq.heappush(self._down, (cylinder, self._seq, arrival_time, sector))
+        else:
+            heapq.heappush(self._down, (-cylinder, self._seq, arrival_time, sector))
+
+    def next(self):
+        """Serve one request.
+
+        Returns (finish_time, cylinder, arrival_time, distance, service_time),
+        where distance and service_time include any sweep to a disk edge made
+        on the way.
+        """
+        if not len(self):
+            return None
+        start_seek, start_time = self.seek_time, self.time
+        if self.algorithm == 'FCFS':
+            cylinder, arrival_time, sector = self._fifo.popleft()
+        elif self.algorithm == 'SSTF':
+            cylinder, arrival_time, sector = self._pop_nearest()
+        elif self.algorithm == 'SCAN':
+            cylinder, arrival_time, sector = self._pop_scan()
+        else:
+            cylinder, arrival_time, sector = self._pop_cscan()
+        self._move(cylinder)
+        if self.cost_model is not None:
+            self.time += self.cost_model.rotational_delay(self.time, sector)
+            self.time += self.cost_model.transfer_time()
+        return (self.time, cylinder, arrival_time,
+                self.seek_time - start_seek, self.time - start_time)
+
+    def replay(self, trace):
+        """Generator mode: consume (arrival_time, cylinder) or
+        (arrival_time, cylinder, sector) tuples in arrival order and yield
+        service events as next() does. Only pending requests are held in
+        memory, so traces of any length can be streamed through."""
+        for arrival_time, cylinder, *sector in trace:
+            while len(self) and self.time < arrival_time:
+                yield self.next()
+            if self.time < arrival_time:  # disk idle until the next arrival
+                self.time = arrival_time
+            self.submit(cylinder, arrival_time, sector[0] if sector else None)
+        while len(self):
+            yield self.next()
+
+    def _seek_cost(self, distance):
+        if self.cost_model is None:
+            return distance
+        return self.cost_model.seek_time(distance)
+
+    def _move(self, cylinder):
+        distance = abs(self.head - cylinder)
+        self.seek_time += distance
+        self.time += self._seek_cost(distance)
+        self.head = cylinder
+
+    def _pop_up(self):
+        cylinder, _, arrival_time, sector = heapq.heappop(self._up)
+        return cylinder, arrival_time, sector
+
+    def _pop_down(self):
+        neg_cylinder, _, arrival_time, sector = heapq.heappop(self._down)
+        return -neg_cylinder, arrival_time, sector
+
+    def _pop_nearest(self):
+        # Ties go to the lower cylinder
+        if not self._up:
+            return self._pop_down()
+        if not self._down:
+            return self._pop_up()
+        if self._up[0][0] - self.head < self.head + self._down[0][0]:
+            return self._pop_up()
+        return self._pop_down()
+
+    def _pop_scan(self):
+        if self.direction == 'right':
+            if self._up:
+                return self._pop_up()
+            self.direction = 'left'  # reverse at the last request, like scan_disk_scheduling
+            return self._pop_down()
+        if self._down:
+            return self._pop_down()
+        self._move(0)  # sweep to cylinder 0 before reversing
+        self.direction = 'right'
+        return self._pop_up()
+
+    def _pop_cscan(self):
+        if not self._up:
+            # Go to the end, jump back to cylinder 0 and start the next sweep
+            end = self.disk_size - 1
+            self._move(end)
+            self.seek_time += end
+            self.time += self._seek_cost(end)
+            self.head = 0
+            self._up, self._down = self._down, self._up
+        return self._pop_up()
@@ -0,0 +1,292 @@
+# Page-replacement policies for demand paging in PagingSystem.
+#
+# A policy tracks the resident pages, keyed by (process_id, page_number), and
+# picks the victim when every frame is in use. PagingSystem calls
+#   insert(key)  when a faulting page is loaded (this counts as a reference)
+#   access(key)  on every later reference to a resident page
+#   victim()     to choose and forget the page to evict
+#   remove(key)  when a page leaves memory for another reason (process freed)
+#
+# Usage:
+#   paging = PagingSystem(8, 100, replacement='lru')
+#   paging = PagingSystem(8, 100, replacement=WorkingSetReplacement(window=50))
+#   paging.run_trace([('A', 120), ('B', 40), ('A', 730)])
+
+import heapq
+from collections import OrderedDict
+
+
+class FIFOReplacement:
+    """Evict the page that was loaded first."""
+
+    name = 'FIFO'
+    trims = False  # only the working-set policy releases pages on its own
+
+    def __init__(self):
+        self._queue = OrderedDict()
+
+    def __len__(self):
+        return len(self._queue)
+
+    def insert(self, key):
+        self._queue[key] = None
+
+    def access(self, key):
+        pass
+
+    def victim(self):
+        return self._queue.popitem(last=False)[0]
+
+    def remove(self, key):
+        del self._queue[key]
+
+
+class LRUReplacement(FIFOReplacement):
+    """Evict the least recently used page. The OrderedDict is kept in recency
+    order, so every operation is O(1)."""
+
+    name = 'LRU'
+
+    def access(self, key):
+        self._queue.move_to_end(key)
+
+
+class ClockReplacement:
+    """Second chance: a hand sweeps a circular buffer of pages, clearing
+    reference bits, and evicts the first page whose bit is already clear."""
+
+    name = 'Clock'
+    trims = False
+
+    def __init__(self):
+        self._pages = []     # circular buffer of keys, None for an empty slot
+        self._referenced = bytearray()
+        self._slot = {}      # key -> index in _pages
+        self._empty = []
+        self._hand = 0
+
+    def __len__(self):
+        return len(self._slot)
+
+    def insert(self, key):
+        if self._empty:
+            slot = self._empty.pop()
+        else:
+            slot = len(self._pages)
+            self._pages.append(None)
+            self._referenced.append(0)
+        self._pages[slot] = key
+        self._referenced[slot] = 1
+        self._slot[key] = slot
+
+    def access(self, key):
+        self._referenced[self._slot[key]] = 1
+
+    def victim(self):
+        pages, referenced = self._pages, self._referenced
+        size = len(pages)
+        while pages[self._hand] is None or referenced[self._hand]:
+            referenced[self._hand] = 0
+            self._hand = (self._hand + 1) % size
+        slot = self._hand
+        self._hand = (slot + 1) % size
+        key = pages[slot]
+        self.remove(key)
+        return key
+
+    def remove(self, key):
+        slot = self._slot.pop(key)
+        self._pages[slot] = None
+        self._referenced[slot] = 0
+        self._empty.append(slot)
+
+
+class LFUReplacement:
+    """Evict the least frequently used page, the least recently used one among
+    equal counts. Pages sit in one OrderedDict per use count and the lowest
+    non-empty count is tracked, so every operation is O(1)."""
+
+    name = 'LFU'
+    trims = False
+
+    def __init__(self):
+        self._count = {}     # key -> use count
+        self._buckets = {}   # use count -> OrderedDict of keys, oldest first
+        self._min = 0
+
+    def __len__(self):
+        return len(self._count)
+
+    def _unlink(self, key):
+        count = self._count.pop(key)
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+        return count
+
+    def _link(self, key, count):
+        self._count[key] = count
+        self._buckets.setdefault(count, OrderedDict())[key] = None
+
+    def insert(self, key):
+        self._link(key, 1)
+        self._min = 1
+
+    def access(self, key):
+        count = self._unlink(key)
+        self._link(key, count + 1)
+        if count == self._min and count not in self._buckets:
+            self._min = count + 1
+
+    def victim(self):
+        if self._min not in self._buckets:  # a remove() emptied the lowest bucket
+            self._min = min(self._buckets)
+        key = next(iter(self._buckets[self._min]))
+        self._unlink(key)
+        return key
+
+    def remove(self, key):
+        self._unlink(key)
+
+
+class OptimalReplacement:
+    """Belady's optimal policy: evict the page whose next use is furthest away.
+
+    prepare(keys) takes the full reference string, as PagingSystem.run_trace
+    passes it, and builds a next-use index in one backward pass. Resident pages
+    sit in a max-heap on next use with lazy deletion, so a reference costs
+    O(log n). Without prepare() every next use is unknown and pages leave in
+    least recently used order.
+    """
+
+    name = 'Optimal'
+    trims = False
+    NEVER = float('inf')
+
+    def __init__(self):
+        self._next_use = None  # reference position -> position of the next reference to the same page
+        self._position = 0
+        self._due = {}         # resident key -> its next use
+        self._heap = []        # (-next use, seq, key), stale entries skipped on pop
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._due)
+
+    def prepare(self, keys):
+        next_use = [self.NEVER] * len(keys)
+        seen = {}
+        for position in range(len(keys) - 1, -1, -1):
+            key = keys[position]
+            next_use[position] = seen.get(key, self.NEVER)
+            seen[key] = position
+        self._next_use = next_use
+        self._position = 0
+
+    def _reference(self, key):
+        next_use = self.NEVER
+        if self._next_use is not None and self._position < len(self._next_use):
+            next_use = self._next_use[self._position]
+        self._position += 1
+        self._due[key] = next_use
+        self._seq += 1
+        heapq.heappush(self._heap, (-next_use, self._seq, key))
+        if len(self._heap) > 4 * len(self._due) + 64:
+            self._heap = [(-due, seq, k) for seq, (k, due) in enumerate(self._due.items())]
+            heapq.heapify(self._heap)
+
+    def insert(self, key):
+        self._reference(key)
+
+    def access(self, key):
+        self._reference(key)
+
+    def victim(self):
+        while True:
+            neg_due, _, key = heapq.heappop(self._heap)
+            if self._due.get(key) == -neg_due:
+                del self._due[key]
+                return key
+
+    def remove(self, key):
+        del self._due[key]
+
+
+class WorkingSetReplacement(LRUReplacement):
+    """Working-set model: a page stays resident while its process referenced
+    it within its last `window` references. Pages that fall out of the window
+    are released by trim() even when memory is not full. If a fault still
+    finds no free frame, the least recently used page is evicted."""
+
+    name = 'Working Set'
+    trims = True
+
+    def __init__(self, window=10):
+        super().__init__()
+        self.window = window
+        self._clock = {}     # process_id -> references made so far
+        self._last_use = {}  # process_id -> OrderedDict(page_number -> reference time), oldest first
+
+    def _touch(self, key):
+        process_id, page_number = key
+        now = self._clock[process_id] = self._clock.get(process_id, 0) + 1
+        pages = self._last_use.setdefault(process_id, OrderedDict())
+        pages[page_number] = now
+        pages.move_to_end(page_number)
+
+    def insert(self, key):
+        super().insert(key)
+        self._touch(key)
+
+    def access(self, key):
+        super().access(key)
+        self._touch(key)
+
+    def trim(self, process_id):
+        """Forget and return the pages of process_id outside its working set."""
+        pages = self._last_use.get(process_id)
+        expired = []
+        if not pages:
+            return expired
+        oldest = self._clock[process_id] - self.window
+        while pages:
+            page_number, last = next(iter(pages.items()))
+            if last > oldest:
+                break
+            del pages[page_number]
+            key = (process_id, page_number)
+            super().remove(key)
+            expired.append(key)
+        return expired
+
+    def working_set(self, process_id):
+        return sorted(self._last_use.get(process_id, ()))
+
+    def victim(self):
+        key = super().victim()
+        del self._last_use[key[0]][key[1]]
+        return key
+
+    def remove(self, key):
+        super().remove(key)
+        del self._last_use[key[0]][key[1]]
+
+
+REPLACEMENT_POLICIES = {
+    'fifo': FIFOReplacement,
+    'lru': LRUReplacement,
+    'clock': ClockReplacement,
+    'lfu': LFUReplacement,
+    'optimal': OptimalReplacement,
+    'working-set': WorkingSetReplacement,
+}
+
+
+def make_policy(policy):
+    """Policy instance from a name in REPLACEMENT_POLICIES or an existing instance."""
+    if isinstance(policy, str):
+        if policy.lower() not in REPLACEMENT_POLICIES:
+            raise ValueError(f"Unknown page-replacement policy: {policy}")
+        return REPLACEMENT_POLICIES[policy.lower()]()
+    return policy
@@ -0,0 +1,332 @@
+# Page-table backends for PagingSystem.
+#
+# Every backend maps (process_id, page_number) -> frame_number and models the
+# cost of the structure it stands for:
+#   footprint()             bytes of page-table memory the structure would occupy
+#   refs_per_translation()  memory references per lookup, averaged so far
+#
+# FlatPageTable is one linear table per process covering the whole virtual
+# address space, HierarchicalPageTable a 2- or 4-level radix tree that only
+# allocates the nodes in use, and InvertedPageTable one entry per physical
+# frame found through a hash anchor table.
+#
+# Usage:
+#   paging = PagingSystem(64, 4096, page_table='four-level', address_bits=48)
+#   python page_tables.py --address-bits 48 --page-size 4096 --pages 2000 --frames 4096
+
+import argparse
+import random
+import sys
+from array import array
+
+ENTRY_BYTES = 8  # one page-table entry
+ANCHOR_BYTES = 4  # one hash anchor / chain link in the inverted table
+
+
+class FlatPageTable:
+    """Single-level table: page_number indexes straight into the process's table,
+    so a lookup is one memory reference, but the table spans every virtual page."""
+
+    name = 'Flat'
+
+    def __init__(self, vpn_bits):
+        self.vpn_bits = vpn_bits
+        self.lookups = 0
+        self.memory_refs = 0
+        self._tables = {}  # process_id -> {page_number: frame_number}
+
+    def __contains__(self, process_id):
+        return process_id in self._tables
+
+    def create(self, process_id):
+        self._tables[process_id] = {}
+
+    def destroy(self, process_id):
+        """Drop a process and return its {page_number: frame_number} mappings."""
+        return self._tables.pop(process_id)
+
+    def lookup(self, process_id, page_number):
+        self.lookups += 1
+        self.memory_refs += 1
+        return self._tables.get(process_id, {}).get(page_number)
+
+    def map(self, process_id, page_number, frame_number):
+        self._tables[process_id][page_number] = frame_number
+
+    def unmap(self, process_id, page_number):
+        return self._tables[process_id].pop(page_number)
+
+    def mappings(self, process_id):
+        return dict(self._tables.get(process_id, {}))
+
+    def footprint(self):
+        return len(self._tables) * (1 << self.vpn_bits) * ENTRY_BYTES
+
+    def refs_per_translation(self):
+        return self.memory_refs / self.lookups if self.lookups else 0.0
+
+
+class HierarchicalPageTable(FlatPageTable):
+    """Radix tree of `levels` tables. The page number is split into one index
+    per level (the top level takes any leftover bits) and a lookup reads one
+    entry per level until it reaches the frame or a missing entry. Only nodes
+    that hold mappings exist; an emptied node is released."""
+
+    def __init__(self, vpn_bits, levels=2):
+        super().__init__(vpn_bits)
+        self.levels = levels
+        self.name = f'{levels}-Level'
+        widths = [vpn_bits // levels] * levels
+        for i in range(vpn_bits % levels):
+            widths[i] += 1
+        self.widths = widths
+        self._shifts = [sum(widths[i + 1:]) for i in range(levels)]
+        self._masks = [(1 << w) - 1 for w in widths]
+        self.node_entries = 0  # sum of the table sizes of all allocated nodes
+
+    def _indexes(self, page_number):
+        return [(page_number >> shift) & mask for shift, mask in zip(self._shifts, self._masks)]
+
+    def create(self, process_id):
+        self._tables[process_id] = {}
+        self.node_entries += 1 << self.widths[0]
+
+    def destroy(self, process_id):
+        found = self.mappings(process_id)
+        stack = [(self._tables.pop(process_id), 0)]
+        while stack:
+            node, level = stack.pop()
+            self.node_entries -= 1 << self.widths[level]
+            if level + 1 < self.levels:
+                stack.extend((child, level + 1) for child in node.values())
+        return found
+
+    def lookup(self, process_id, page_number):
+        self.lookups += 1
+        node = self._tables.get(process_id)
+        if node is None or not 0 <= page_number < 1 << self.vpn_bits:
+            return None  # the masked indexes would alias a page inside the address space
+        for shift, mask in zip(self._shifts, self._masks):
+            self.memory_refs += 1
+            node = node.get((page_number >> shift) & mask)
+            if node is None:
+                return None
+        return node
+
+    def map(self, process_id, page_number, frame_number):
+        node = self._tables[process_id]
+        indexes = self._indexes(page_number)
+        for level, index in enumerate(indexes[:-1]):
+            child = node.get(index)
+            if child is None:
+                child = node[index] = {}
+                self.node_entries += 1 << self.widths[level + 1]
+            node = child
+        node[indexes[-1]] = frame_number
+
+    def unmap(self, process_id, page_number):
+        path = [self._tables[process_id]]
+        indexes = self._indexes(page_number)
+        for index in indexes[:-1]:
+            path.append(path[-1][index])
+        frame_number = path[-1].pop(indexes[-1])
+        for level in range(self.levels - 1, 0, -1):  # release empty nodes below the root
+            if path[level]:
+                break
+            del path[level - 1][indexes[level - 1]]
+            self.node_entries -= 1 << self.widths[level]
+        return frame_number
+
+    def mappings(self, process_id):
+        found = {}
+        root = self._tables.get(process_id)
+        stack = [] if root is None else [(root, 0, 0)]
+        while stack:
+            node, level, prefix = stack.pop()
+            for index, child in node.items():
+                page_prefix = (prefix << self.widths[level]) | index
+                if level + 1 < self.levels:
+                    stack.append((child, level + 1, page_prefix))
+                else:
+                    found[page_prefix] = child
+        return found
+
+    def footprint(self):
+        return self.node_entries * ENTRY_BYTES
+
+
+class InvertedPageTable(FlatPageTable):
+    """One entry per physical frame holding its (process_id, page_number).
+
+    A hash anchor table with a power-of-two size of at least num_frames points
+    to the first frame of each chain, and every frame entry links to the next
+    frame with the same hash. A lookup reads the anchor and then one entry per
+    chain link, so its cost depends on collisions rather than address size,
+    and the structure's size depends only on physical memory.
+    """
+
+    name = 'Inverted'
+
+    def __init__(self, vpn_bits, num_frames):
+        super().__init__(vpn_bits)
+        self.num_frames = num_frames
+        size = 1
+        while size < num_frames:
+            size <<= 1
+        self._mask = size - 1
+        self._anchor = array('i', [-1]) * size
+        self._next = array('i', [-1]) * num_frames
+        self._owner = [None] * num_frames  # frame -> (process_id, page_number)
+        self._process_ids = {}  # process_id -> small integer, keeps hashing independent of hash()
+        self._free_ids = []
+
+    def _bucket(self, process_id, page_number):
+        h = (self._process_ids[process_id] * 0x9E3779B1) ^ (page_number * 0x85EBCA6B)
+        return (h ^ (h >> 16)) & self._mask
+
+    def __contains__(self, process_id):
+        return process_id in self._process_ids
+
+    def create(self, process_id):
+        self._process_ids[process_id] = self._free_ids.pop() if self._free_ids else len(self._process_ids)
+
+    def destroy(self, process_id):
+        found = self.mappings(process_id)
+        for page_number in found:
+            self.unmap(process_id, page_number)
+        self._free_ids.append(self._process_ids.pop(process_id))
+        return found
+
+    def _find(self, process_id, page_number):
+        # (previous frame in the chain, frame), frame is -1 when not mapped
+        bucket = self._bucket(process_id, page_number)
+        previous, frame = -1, self._anchor[bucket]
+        self.memory_refs += 1
+        key = (process_id, page_number)
+        while frame != -1:
+            self.memory_refs += 1
+            if self._owner[frame] == key:
+                break
+            previous, frame = frame, self._next[frame]
+        return bucket, previous, frame
+
+    def lookup(self, process_id, page_number):
+        self.lookups += 1
+        if process_id not in self._process_ids:
+            return None
+        frame = self._find(process_id, page_number)[2]
+        return None if frame == -1 else frame
+
+    def map(self, process_id, page_number, frame_number):
+        bucket = self._bucket(process_id, page_number)
+        self._owner[frame_number] = (process_id, page_number)
+        self._next[frame_number] = self._anchor[bucket]
+        self._anchor[bucket] = frame_number
+
+    def unmap(self, process_id, page_number):
+        refs = self.memory_refs  # bookkeeping walks are not translations
+        bucket, previous, frame = self._find(process_id, page_number)
+        self.memory_refs = refs
+        if frame == -1:
+            raise KeyError((process_id, page_number))
+        if previous == -1:
+            self._anchor[bucket] = self._next[frame]
+        else:
+            self._next[previous] = self._next[frame]
+        self._next[frame] = -1
+        self._owner[frame] = None
+        return frame
+
+    def mappings(self, process_id):
+        return {owner[1]: frame for frame, owner in enumerate(self._owner)
+                if owner is not None and owner[0] == process_id}
+
+    def footprint(self):
+        return len(self._anchor) * ANCHOR_BYTES + self.num_frames * (ENTRY_BYTES + ANCHOR_BYTES)
+
+
+PAGE_TABLES = ('flat', 'two-level', 'four-level', 'inverted')
+
+
+def vpn_bits_for(address_bits, page_size):
+    """Bits needed for a page number when page_size need not be a power of two."""
+    return max(1, ((1 << address_bits) // page_size - 1).bit_length())
+
+
+def make_page_table(kind, address_bits, page_size, num_frames):
+    """Backend from a name in PAGE_TABLES, or an existing backend passed through."""
+    if not isinstance(kind, str):
+        return kind
+    vpn_bits = vpn_bits_for(address_bits, page_size)
+    if kind == 'flat':
+        return FlatPageTable(vpn_bits)
+    if kind == 'two-level':
+        return HierarchicalPageTable(vpn_bits, 2)
+    if kind == 'four-level':
+        return HierarchicalPageTable(vpn_bits, 4)
+    if kind == 'inverted':
+        return InvertedPageTable(vpn_bits, num_frames)
+    raise ValueError(f"Unknown page table: {kind}")
+
+
+def sparse_pages(n, vpn_bits, regions=8, seed=0):
+    """n distinct page numbers in a few contiguous regions scattered over the
+    virtual address space, like code, heap, mmap areas and stacks."""
+    rng = random.Random(seed)
+    pages = set()
+    per_region = max(1, n // regions)
+    while len(pages) < n:
+        start = rng.randrange(1 << vpn_bits)
+        pages.update(range(start, min(start + per_region, 1 << vpn_bits)))
+    return sorted(pages)[:n]
+
+
+def compare_page_tables(pages, processes, address_bits, page_size, num_frames,
+                        kinds=PAGE_TABLES, lookups=100000, seed=0):
+    """Map the same pages for every process in each backend, replay random
+    lookups, and return {kind: {'footprint_bytes', 'refs_per_translation'}}."""
+    rng = random.Random(seed)
+    keys = [(pid, page) for pid in range(processes) for page in pages]
+    if len(keys) > num_frames:
+        raise ValueError("More mapped pages than frames")
+    probes = [rng.choice(keys) for _ in range(lookups)]
+    results = {}
+    for kind in kinds:
+        table = make_page_table(kind, address_bits, page_size, num_frames)
+        for pid in range(processes):
+            table.create(pid)
+        for frame, (pid, page) in enumerate(keys):
+            table.map(pid, page, frame)
+        for pid, page in probes:
+            table.lookup(pid, page)
+        results[table.name] = {'footprint_bytes': table.footprint(),
+                               'refs_per_translation': table.refs_per_translation()}
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare page-table structures on a sparse address space.")
+    parser.add_argument('--address-bits', type=int, default=48)
+    parser.add_argument('--page-size', type=int, default=4096)
+    parser.add_argument('--pages', type=int, default=2000, help="mapped pages per process")
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--frames', type=int, default=16384)
+    parser.add_argument('--lookups', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    vpn_bits = vpn_bits_for(args.address_bits, args.page_size)
+    pages = sparse_pages(args.pages, vpn_bits, seed=args.seed)
+    results = compare_page_tables(pages, args.processes, args.address_bits, args.page_size,
+                                  args.frames, lookups=args.lookups, seed=args.seed)
+
+    print(f"--- Page Tables ({args.address_bits}-bit addresses, {args.page_size}-byte pages, "
+          f"{args.processes} x {args.pages} mapped pages, {args.frames} frames) ---")
+    print(f"{'structure':<10} {'footprint':>22} {'refs/translation':>17}")
+    for name, r in results.items():
+        print(f"{name:<10} {r['footprint_bytes']:>22,} {r['refs_per_translation']:>17.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,31 +1,38 @@
-def scan_disk_scheduling(requests, head, disk_size, direction):
-    requests.sort()
-    left = [r for r in requests if r < head]
-    right = [r for r in requests if r >= head]
+from bisect import bisect_left
+
+
+def scan_disk_scheduling(requests, head, disk_size, direction, presorted=False):
+    # The caller's list is left untouched; pass presorted=True to skip the sort
+    ordered = requests if presorted else sorted(requests)
+    split = bisect_left(ordered, head)  # ordered[:split] < head <= ordered[split:]
 
     seek_sequence = []
     seek_time = 0
     current = head
 
     if direction == "left":
-        for r in reversed(left):
+        for i in range(split - 1, -1, -1):
+            r = ordered[i]
             seek_sequence.append(r)
             seek_time += abs(current - r)
             current = r
         seek_sequence.append(0)
         seek_time += current
         current = 0
-        for r in right:
+        for i in range(split, len(ordered)):
+            r = ordered[i]
             seek_sequence.append(r)
             seek_time += abs(current - r)
             current = r
     else:
-        for r in right:
+        for i in range(split, len(ordered)):
+            r = ordered[i]
             seek_sequence.append(r)
             seek_time += abs(current - r)
             current = r
-        
-        for r in reversed(left):
+
+        for i in range(split - 1, -1, -1):
+            r = ordered[i]
             seek_sequence.append(r)
             seek_time += abs(current - r)
             current = r
@@ -0,0 +1,27 @@
+from bisect import bisect_left
+
+
+def sstf_disk_scheduling(requests, head, presorted=False):
+    # The requests already served always form a contiguous run of the sorted
+    # list, so the nearest pending request is just outside one end of it.
+    ordered = requests if presorted else sorted(requests)
+    right = bisect_left(ordered, head)
+    left = right - 1
+
+    seek_sequence = []
+    seek_time = 0
+    current = head
+
+    while left >= 0 or right < len(ordered):
+        # Ties go to the lower cylinder
+        if right >= len(ordered) or (left >= 0 and current - ordered[left] <= ordered[right] - current):
+            r = ordered[left]
+            left -= 1
+        else:
+            r = ordered[right]
+            right += 1
+        seek_sequence.append(r)
+        seek_time += abs(current - r)
+        current = r
+
+    return seek_sequence, seek_time
@@ -0,0 +1,331 @@
+# Real-thread benchmark for the synchronization scenarios.
+#
+# Runs the race, mutex, semaphore and producer-consumer scenarios of
+# Group5_Multithreading_and_Synchronization.py on real primitives
+#   threading:        threading.Lock, threading.Semaphore, queue.Queue
+#   multiprocessing:  multiprocessing.Lock, .Semaphore, .Queue, shared Value
+# for 1..N workers, and prints ops/sec, the scaling curve, how often an
+# acquire had to block, and wait/hold latency percentiles next to what the
+# simulator predicts for the same scenario and worker count.
+#
+# Latencies are kept in log2 histograms (bucket b holds times in
+# [2^(b-1), 2^b) ns), so recording one costs an index and an increment. An
+# acquire first tries without blocking; a failed try counts as contended,
+# which is the real counterpart of the simulator's "blocked" count.
+#
+# "lost" counts counter updates that went missing. The simulator runs INC as
+# one atomic step, so it never loses one; real unsynchronized threads (race)
+# and a semaphore with more than one permit can.
+#
+# Usage:
+#   python sync_benchmark.py --workers 8 --ops 20000
+#   python sync_benchmark.py --scenarios mutex prod_cons --backends threading --histograms
+
+import argparse
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+
+from Group5_Multithreading_and_Synchronization import DemoScheduler, Mutex, Semaphore, SimThread, compile_program
+from sync_scenarios import producer_consumer
+
+SCENARIOS = ('race', 'mutex', 'semaphore', 'prod_cons')
+BACKENDS = ('threading', 'multiprocessing')
+BUCKETS = 48  # 2^47 ns is about 39 hours
+
+
+class LatencyHistogram:
+    """Counts of durations in log2 nanosecond buckets."""
+
+    def __init__(self, counts=None):
+        self.counts = list(counts) if counts is not None else [0] * BUCKETS
+
+    def __len__(self):
+        return sum(self.counts)
+
+    def merge(self, counts):
+        for i, count in enumerate(counts):
+            self.counts[i] += count
+
+    def percentile(self, p):
+        """Upper bound in ns of the bucket holding the p-th percentile, or None if empty."""
+        total = len(self)
+        if not total:
+            return None
+        rank = max(1, -(-p * total // 100))
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return 1 << bucket
+        return 1 << (BUCKETS - 1)
+
+    def lines(self, width=40):
+        """Text rendering, one line per non-empty bucket."""
+        used = [b for b, count in enumerate(self.counts) if count]
+        if not used:
+            return ["  (no samples)"]
+        peak = max(self.counts)
+        return [f"  < {_format_ns(1 << b):>9} {self.counts[b]:>10} "
+                f"{'#' * max(1, self.counts[b] * width // peak) if self.counts[b] else ''}"
+                for b in range(used[0], used[-1] + 1)]
+
+
+def _format_ns(ns):
+    if ns is None:
+        return '-'
+    if ns < 1000:
+        return f"{ns}ns"
+    if ns < 1000000:
+        return f"{ns / 1000:.0f}us"
+    return f"{ns / 1000000:.1f}ms"
+
+
+class _Counter:
+    """Plain shared counter for threads, the counterpart of a lock-free multiprocessing Value."""
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+
+# Workers are module-level functions so multiprocessing can pickle them.
+# Each one waits at `start`, runs `ops` operations and puts
+# (contended, wait histogram counts, hold histogram counts) on `results`.
+
+def _race_worker(counter, ops, start, results):
+    start.wait()
+    for _ in range(ops):
+        counter.value += 1  # read-modify-write without a lock
+    results.put((0, [0] * BUCKETS, [0] * BUCKETS))
+
+
+def _lock_worker(lock, counter, ops, start, results):
+    # Mutex and semaphore scenarios: acquire, update the counter, release
+    wait = [0] * BUCKETS
+    hold = [0] * BUCKETS
+    contended = 0
+    clock = time.perf_counter_ns
+    top = BUCKETS - 1
+    start.wait()
+    for _ in range(ops):
+        t0 = clock()
+        if not lock.acquire(False):
+            contended += 1
+            lock.acquire()
+        t1 = clock()
+        counter.value += 1
+        lock.release()
+        t2 = clock()
+        wait[min((t1 - t0).bit_length(), top)] += 1
+        hold[min((t2 - t1).bit_length(), top)] += 1
+    results.put((contended, wait, hold))
+
+
+def _producer_worker(buffer, ops, start, results):
+    wait = [0] * BUCKETS
+    contended = 0
+    clock = time.perf_counter_ns
+    top = BUCKETS - 1
+    start.wait()
+    for item in range(ops):
+        t0 = clock()
+        try:
+            buffer.put_nowait(item)
+        except queue.Full:
+            contended += 1
+            buffer.put(item)
+        wait[min((clock() - t0).bit_length(), top)] += 1
+    results.put((contended, wait, [0] * BUCKETS))
+
+
+def _consumer_worker(buffer, ops, start, results):
+    wait = [0] * BUCKETS
+    contended = 0
+    clock = time.perf_counter_ns
+    top = BUCKETS - 1
+    start.wait()
+    for _ in range(ops):
+        t0 = clock()
+        try:
+            buffer.get_nowait()
+        except queue.Empty:
+            contended += 1
+            buffer.get()
+        wait[min((clock() - t0).bit_length(), top)] += 1
+    results.put((contended, wait, [0] * BUCKETS))
+
+
+def _primitives(backend):
+    # (Lock, Semaphore, bounded Queue, Barrier, result Queue, Worker, counter factory)
+    if backend == 'threading':
+        return (threading.Lock, threading.Semaphore, queue.Queue, threading.Barrier, queue.Queue,
+                threading.Thread, _Counter)
+    if backend == 'multiprocessing':
+        ctx = multiprocessing.get_context()
+        return (ctx.Lock, ctx.Semaphore, ctx.Queue, ctx.Barrier, ctx.Queue, ctx.Process,
+                lambda: ctx.Value('q', 0, lock=False))
+    raise ValueError(f"Unknown backend: {backend}")
+
+
+def benchmark(scenario, backend='threading', workers=2, ops=10000, buffer_size=16, permits=2):
+    """Run one scenario on real primitives and return its measurements.
+
+    race/mutex/semaphore start `workers` workers doing `ops` operations each;
+    prod_cons starts `workers` producers and `workers` consumers moving `ops`
+    items each through a queue of buffer_size slots. Operations are counted
+    per item moved, so every scenario reports workers * ops operations.
+    """
+    if scenario not in SCENARIOS:
+        raise ValueError(f"Unknown scenario: {scenario}")
+    Lock, Sem, BoundedQueue, Barrier, ResultQueue, Worker, make_counter = _primitives(backend)
+    results = ResultQueue()
+    counter = make_counter()
+    if scenario == 'prod_cons':
+        buffer = BoundedQueue(buffer_size)
+        jobs = [(_producer_worker, (buffer,)) for _ in range(workers)]
+        jobs += [(_consumer_worker, (buffer,)) for _ in range(workers)]
+    elif scenario == 'race':
+        jobs = [(_race_worker, (counter,))] * workers
+    else:
+        lock = Lock() if scenario == 'mutex' else Sem(permits)
+        jobs = [(_lock_worker, (lock, counter))] * workers
+    start = Barrier(len(jobs) + 1)
+    procs = [Worker(target=target, args=args + (ops, start, results), daemon=True) for target, args in jobs]
+    for proc in procs:
+        proc.start()
+    start.wait()
+    began = time.perf_counter()
+    contended = 0
+    wait, hold = LatencyHistogram(), LatencyHistogram()
+    for _ in procs:  # drain before join: a process cannot exit with unread queue data
+        c, w, h = results.get()
+        contended += c
+        wait.merge(w)
+        hold.merge(h)
+    elapsed = time.perf_counter() - began
+    for proc in procs:
+        proc.join()
+    total = workers * ops
+    acquires = len(wait)
+    return {
+        'scenario': scenario,
+        'backend': backend,
+        'workers': workers,
+        'ops': total,
+        'seconds': elapsed,
+        'ops_per_sec': total / elapsed if elapsed else 0.0,
+        'contended': contended / acquires if acquires else 0.0,
+        'lost_updates': total - counter.value if scenario in ('race', 'mutex', 'semaphore') else 0,
+        'wait': wait,
+        'hold': hold,
+    }
+
+
+def simulate(scenario, workers=2, ops=100, buffer_size=16, permits=2):
+    """The same scenario in the thread simulator (round robin, one instruction
+    per tick) and what it predicts: operations per tick, the share of
+    acquires that block, the mean ticks a blocked acquire waits, and lost
+    updates."""
+    if scenario == 'prod_cons':
+        sched = producer_consumer(workers, workers, buffer_size, ops)
+        key = 'consumed'
+    else:
+        sched = DemoScheduler(sink=None)
+        key = 'counter'
+        if scenario == 'race':
+            body = [('COMPUTE',), ('INC', key), ('YIELD',)]
+        elif scenario == 'mutex':
+            m = Mutex('lock')
+            body = [('ENTER_MUTEX', m), ('INC', key), ('EXIT_MUTEX', m), ('YIELD',)]
+        else:
+            pool = Semaphore('pool', permits)
+            body = [('WAIT_SEM', pool), ('INC', key), ('SIGNAL_SEM', pool), ('YIELD',)]
+        program = compile_program(body * ops)
+        for i in range(workers):
+            sched.add_thread(SimThread(f'T{i}', program))
+    sched.run_events()
+    stats = sched.contention_stats().values()
+    acquisitions = sum(st['acquisitions'] for st in stats)
+    blocked = sum(st['blocked'] for st in stats)
+    total = workers * ops
+    return {
+        'ops': total,
+        'ticks': sched.time,
+        'ops_per_tick': sched.shared.get(key, 0) / sched.time if sched.time else 0.0,
+        'blocked': blocked / acquisitions if acquisitions else 0.0,
+        'mean_wait_ticks': sum(st['wait_total'] for st in stats) / blocked if blocked else 0.0,
+        'lost_updates': total - sched.shared.get(key, 0),
+    }
+
+
+def worker_counts(max_workers):
+    """1, 2, 4, ... up to max_workers, always ending with max_workers."""
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    counts = []
+    n = 1
+    while n < max_workers:
+        counts.append(n)
+        n *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def scaling(scenario, backend, max_workers, ops, buffer_size=16, permits=2, sim_ops=200):
+    """[(benchmark result, simulator result)] for each count in worker_counts(max_workers)."""
+    return [(benchmark(scenario, backend, n, ops, buffer_size, permits),
+             simulate(scenario, n, sim_ops, buffer_size, permits))
+            for n in worker_counts(max_workers)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark real threading/multiprocessing primitives "
+                                                 "against the thread simulator's predictions.")
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument('--workers', type=int, default=min(8, os.cpu_count() or 1) * 2,
+                        help="largest worker count; the curve runs 1, 2, 4, ... up to it")
+    parser.add_argument('--ops', type=int, default=10000, help="operations per worker")
+    parser.add_argument('--buffer', type=int, default=16, help="producer-consumer queue size")
+    parser.add_argument('--permits', type=int, default=2, help="semaphore permits")
+    parser.add_argument('--sim-ops', type=int, default=200, help="operations per simulated thread")
+    parser.add_argument('--histograms', action='store_true', help="print wait/hold histograms at the largest worker count")
+    args = parser.parse_args(argv)
+    for option in ('workers', 'ops', 'buffer', 'permits', 'sim_ops'):
+        if getattr(args, option) < 1:
+            parser.error(f"--{option.replace('_', '-')} must be at least 1")
+
+    print(f"{os.cpu_count()} CPUs, Python {sys.version.split()[0]}, multiprocessing start method "
+          f"'{multiprocessing.get_start_method()}'")
+    for scenario in args.scenarios:
+        for backend in args.backends:
+            rows = scaling(scenario, backend, args.workers, args.ops, args.buffer, args.permits, args.sim_ops)
+            base = rows[0][0]['ops_per_sec']
+            sim_base = rows[0][1]['ops_per_tick']
+            print(f"\n--- {scenario}, {backend} ({args.ops} ops per worker) ---")
+            print(f"{'workers':>7} {'ops/s':>11} {'speedup':>7} {'contended':>9} {'lost':>7} {'wait p50':>9} "
+                  f"{'wait p99':>9} {'hold p99':>9} | {'sim op/tick':>11} {'speedup':>7} {'blocked':>7} "
+                  f"{'wait ticks':>10} {'lost':>5}")
+            for real, sim in rows:
+                print(f"{real['workers']:>7} {real['ops_per_sec']:>11,.0f} {real['ops_per_sec'] / base:>7.2f} "
+                      f"{real['contended']:>9.1%} {real['lost_updates']:>7} "
+                      f"{_format_ns(real['wait'].percentile(50)):>9} {_format_ns(real['wait'].percentile(99)):>9} "
+                      f"{_format_ns(real['hold'].percentile(99)):>9} | {sim['ops_per_tick']:>11.3f} "
+                      f"{sim['ops_per_tick'] / sim_base if sim_base else 0:>7.2f} {sim['blocked']:>7.1%} "
+                      f"{sim['mean_wait_ticks']:>10.1f} {sim['lost_updates']:>5}")
+            if args.histograms and scenario != 'race':
+                real = rows[-1][0]
+                print(f"wait latency, {real['workers']} workers:")
+                print("\n".join(real['wait'].lines()))
+                if len(real['hold']):
+                    print(f"hold latency, {real['workers']} workers:")
+                    print("\n".join(real['hold'].lines()))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,219 @@
+# Parameterized synchronization workloads for the thread simulator.
+#
+# Each builder returns a ScenarioScheduler with its threads added, ready to
+# run. Threads in the same role share one compiled Program (dining
+# philosophers share the code and differ only in their forks), so a scenario
+# with thousands of threads holds one copy of each role's instructions.
+# run_scenario() runs it and reports
+#   throughput  completed items per tick
+#   fairness    Jain's index over the threads' progress rates (items per tick
+#               from arrival to finish): 1.0 when every thread progressed at
+#               the same rate, 1/n when one thread did all the work, None
+#               when no thread made progress
+#
+# Usage:
+#   python sync_scenarios.py producer-consumer --producers 1000 --consumers 500 --buffer 64 --items 20
+#   python sync_scenarios.py readers-writers --readers 2000 --writers 50 --max-readers 16
+#   python sync_scenarios.py philosophers --threads 2000 --rounds 5 --unordered
+#   python sync_scenarios.py barrier --threads 4000 --rounds 10 --skew 3 --policy cfs
+
+import argparse
+import sys
+
+from Group5_Multithreading_and_Synchronization import (POLICIES, Barrier, DemoScheduler, Mutex, Semaphore,
+                                                       SimThread, compile_program)
+
+
+class ScenarioScheduler(DemoScheduler):
+    """DemoScheduler that also counts the INC instructions each thread runs.
+    items_keys names the shared counters that count as completed items."""
+
+    def __init__(self, items_keys, policy=None, sink=None):
+        super().__init__(sink=sink, policy=policy)
+        self.items_keys = items_keys
+        self.items = {}  # thread -> INC instructions run
+
+    def _op_inc(self, thread, key):
+        super()._op_inc(thread, key)
+        self.items[thread] = self.items.get(thread, 0) + 1
+
+
+def producer_consumer(producers=2, consumers=2, buffer_size=4, items=10, policy=None, sink=None):
+    """Bounded buffer of buffer_size slots: each producer makes `items` items
+    and the consumers share them out as evenly as possible. Consumers left
+    without an item (fewer items than consumers) are not started."""
+    if producers < 1 or consumers < 1:
+        raise ValueError("Producer-consumer needs at least 1 producer and 1 consumer")
+    if buffer_size < 1 or items < 1:
+        raise ValueError("Buffer size and items per producer must be at least 1")
+    mutex = Mutex('buf_mutex')
+    empty = Semaphore('empty', buffer_size)
+    full = Semaphore('full', 0)
+    producer = compile_program([('WAIT_SEM', empty), ('ENTER_MUTEX', mutex), ('INC', 'produced'),
+                                ('EXIT_MUTEX', mutex), ('SIGNAL_SEM', full), ('YIELD',)] * items)
+
+    def consumer(count):
+        return compile_program([('WAIT_SEM', full), ('ENTER_MUTEX', mutex), ('INC', 'consumed'),
+                                ('EXIT_MUTEX', mutex), ('SIGNAL_SEM', empty), ('YIELD',)] * count)
+
+    base, extra = divmod(producers * items, consumers)
+    programs = {base: consumer(base), base + 1: consumer(base + 1)}
+    sched = ScenarioScheduler(('consumed',), policy, sink)
+    for i in range(producers):
+        sched.add_thread(SimThread(f'P{i}', producer))
+    for i in range(consumers if base else extra):
+        sched.add_thread(SimThread(f'C{i}', programs[base + 1 if i < extra else base]))
+    return sched
+
+
+def readers_writers(readers=8, writers=2, rounds=5, max_readers=4, policy=None, sink=None):
+    """Readers take one of max_readers slots of a counting semaphore; a writer
+    takes every slot, one writer at a time, so it excludes all readers."""
+    if max_readers < 1:
+        raise ValueError("Readers-writers needs at least 1 reader slot")
+    room = Semaphore('room', max_readers)
+    write_lock = Mutex('write_lock')
+    reader = compile_program([('WAIT_SEM', room), ('INC', 'reads'), ('COMPUTE',), ('SIGNAL_SEM', room),
+                              ('YIELD',)] * rounds)
+    writer = compile_program(([('ENTER_MUTEX', write_lock)] + [('WAIT_SEM', room)] * max_readers
+                              + [('INC', 'writes')] + [('SIGNAL_SEM', room)] * max_readers
+                              + [('EXIT_MUTEX', write_lock), ('YIELD',)]) * rounds)
+    sched = ScenarioScheduler(('reads', 'writes'), policy, sink)
+    for i in range(readers):
+        sched.add_thread(SimThread(f'R{i}', reader))
+    for i in range(writers):
+        sched.add_thread(SimThread(f'W{i}', writer))
+    return sched
+
+
+def dining_philosophers(philosophers=5, rounds=3, ordered=True, policy=None, sink=None):
+    """Philosopher i needs forks i and i+1. With ordered=True everyone picks up
+    the lower-numbered fork first, which rules out a deadlock; with
+    ordered=False everyone picks up the left fork first, which can deadlock."""
+    if philosophers < 2:
+        raise ValueError("Dining philosophers needs at least 2 philosophers")
+    first, second = Mutex('first'), Mutex('second')  # placeholders, rebound per philosopher
+    template = compile_program([('ENTER_MUTEX', first), ('ENTER_MUTEX', second), ('INC', 'meals'),
+                                ('COMPUTE',), ('EXIT_MUTEX', second), ('EXIT_MUTEX', first),
+                                ('YIELD',)] * rounds)
+    forks = [Mutex(f'fork{i}') for i in range(philosophers)]
+    sched = ScenarioScheduler(('meals',), policy, sink)
+    for i in range(philosophers):
+        left, right = i, (i + 1) % philosophers
+        if ordered and right < left:
+            left, right = right, left
+        sched.add_thread(SimThread(f'Ph{i}', template.rebind({first: forks[left], second: forks[right]})))
+    return sched
+
+
+def barrier_phases(workers=8, rounds=5, work=2, skew=0, policy=None, sink=None):
+    """Workers compute, then meet at a barrier, `rounds` times. Worker i does
+    work + i % (skew + 1) COMPUTE steps per phase, so with skew > 0 the faster
+    workers wait at the barrier for the slower ones."""
+    if workers < 1:
+        raise ValueError("Barrier phases needs at least 1 worker")
+    if skew < 0 or work < 0:
+        raise ValueError("Barrier work and skew cannot be negative")
+    barrier = Barrier('phase', workers)
+    programs = {}
+    sched = ScenarioScheduler(('work',), policy, sink)
+    for i in range(workers):
+        steps = work + i % (skew + 1)
+        if steps not in programs:
+            programs[steps] = compile_program(([('COMPUTE',)] * steps + [('INC', 'work'), ('BARRIER', barrier)])
+                                              * rounds)
+        sched.add_thread(SimThread(f'B{i}', programs[steps]))
+    return sched
+
+
+SCENARIOS = {
+    'producer-consumer': producer_consumer,
+    'readers-writers': readers_writers,
+    'philosophers': dining_philosophers,
+    'barrier': barrier_phases,
+}
+
+
+def jain_index(values):
+    """Jain's fairness index, (sum x)^2 / (n * sum x^2), or None when every
+    value is 0 and there is nothing to compare."""
+    square_sum = sum(v * v for v in values)
+    if not square_sum:
+        return None
+    return sum(values) ** 2 / (len(values) * square_sum)
+
+
+def run_scenario(sched, event=True):
+    """Run a built scenario (event-driven by default) and return its report."""
+    if event:
+        sched.run_events()
+    else:
+        sched.run(max_ticks=10 ** 9)
+    ticks = sched.time
+    items = sum(sched.shared.get(key, 0) for key in sched.items_keys)
+    rates = []
+    for thread in sched.threads:
+        end = thread.finish_time if thread.finish_time is not None else ticks
+        rates.append(sched.items.get(thread, 0) / max(1, end - thread.arrival_time))
+    threads = len(sched.threads)
+    return {
+        'threads': threads,
+        'ticks': ticks,
+        'items': items,
+        'throughput': items / ticks if ticks else 0.0,
+        'fairness': jain_index(rates),
+        'mean_wait': sum(t.wait_time for t in sched.threads) / threads if threads else 0.0,
+        'deadlocks': len(sched.deadlocks),
+        'stalled': len(sched.stalled()),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a scaled synchronization scenario in the thread simulator.")
+    parser.add_argument('scenario', choices=sorted(SCENARIOS))
+    parser.add_argument('--producers', type=int, default=100)
+    parser.add_argument('--consumers', type=int, default=100)
+    parser.add_argument('--buffer', type=int, default=16, help="bounded buffer slots")
+    parser.add_argument('--items', type=int, default=10, help="items per producer")
+    parser.add_argument('--readers', type=int, default=200)
+    parser.add_argument('--writers', type=int, default=20)
+    parser.add_argument('--max-readers', type=int, default=8)
+    parser.add_argument('--threads', type=int, default=1000, help="philosophers or barrier workers")
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--work', type=int, default=2, help="COMPUTE steps per barrier phase")
+    parser.add_argument('--skew', type=int, default=0, help="extra COMPUTE steps for slower barrier workers")
+    parser.add_argument('--unordered', action='store_true', help="philosophers take the left fork first")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='rr')
+    parser.add_argument('--tick', action='store_true', help="use the tick loop instead of run_events()")
+    args = parser.parse_args(argv)
+
+    policy = POLICIES[args.policy]()
+    try:
+        if args.scenario == 'producer-consumer':
+            sched = producer_consumer(args.producers, args.consumers, args.buffer, args.items, policy)
+        elif args.scenario == 'readers-writers':
+            sched = readers_writers(args.readers, args.writers, args.rounds, args.max_readers, policy)
+        elif args.scenario == 'philosophers':
+            sched = dining_philosophers(args.threads, args.rounds, not args.unordered, policy)
+        else:
+            sched = barrier_phases(args.threads, args.rounds, args.work, args.skew, policy)
+    except ValueError as e:
+        parser.error(str(e))
+    r = run_scenario(sched, not args.tick)
+
+    print(f"--- {args.scenario} ({r['threads']} threads, {getattr(policy, 'name', args.policy)}) ---")
+    print(f"ticks: {r['ticks']}  items: {r['items']}  throughput: {r['throughput']:.4f} items/tick")
+    fairness = '-' if r['fairness'] is None else f"{r['fairness']:.4f}"
+    print(f"fairness (Jain): {fairness}  mean ready-queue wait: {r['mean_wait']:.1f} ticks")
+    if r['deadlocks'] or r['stalled']:
+        print(f"deadlocks: {r['deadlocks']}  threads left blocked: {r['stalled']}")
+    stats = sorted(sched.contention_stats().items(), key=lambda item: -item[1]['wait_total'])
+    print(f"{'primitive':<12} {'kind':<9} {'acquires':>8} {'blocked':>8} {'wait tot':>10} {'wait max':>8}")
+    for name, st in stats[:5]:
+        print(f"{name:<12} {st['kind']:<9} {st['acquisitions']:>8} {st['blocked']:>8} {st['wait_total']:>10} "
+              f"{st['wait_max']:>8}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
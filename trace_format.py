@@ -0,0 +1,271 @@
+# Binary trace files for the disk and paging simulators.
+#
+# A trace file is a 32-byte header followed by fixed-width little-endian records:
+#
+#   header   magic b'OSTRACE\0', version u16, kind u16, record_size u32, count u64, 8 reserved bytes
+#   disk     time f64 (ms), cylinder i32, sector i32 (-1 when unknown)        16 bytes
+#   address  pid i32, op i32 (0 read, 1 write, 2 fetch), address i64          16 bytes
+#
+# TraceFile maps the file with mmap; with numpy the records are exposed as a
+# structured array over the mapping (np.frombuffer, no copy), so columns can be
+# handed straight to disk_scheduling and PagingSystem.translate_trace.
+#
+# Usage:
+#   python trace_format.py convert blkparse.txt disk.trace --kind disk --sectors-per-cylinder 1008
+#   python trace_format.py convert refs.csv refs.trace --kind address
+#   python trace_format.py info disk.trace
+#
+#   with TraceFile('disk.trace') as trace:
+#       scan_disk_scheduling(trace.column('cylinder'), 0, 5000, 'right')
+#   with TraceFile('refs.trace') as trace:
+#       paging.run_trace(trace.address_events())
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, columns are then copied into array('...')
+    np = None
+
+MAGIC = b'OSTRACE\0'
+VERSION = 1
+HEADER = struct.Struct('<8sHHIQ8x')
+KINDS = {'disk': 1, 'address': 2}
+RECORDS = {
+    'disk': struct.Struct('<dii'),
+    'address': struct.Struct('<iiq'),
+}
+FIELDS = {
+    'disk': (('time', 'd'), ('cylinder', 'i'), ('sector', 'i')),
+    'address': (('pid', 'i'), ('op', 'i'), ('address', 'q')),
+}
+OPS = {'R': 0, 'W': 1, 'F': 2}
+
+
+def _dtype(kind):
+    return np.dtype([(name, '<' + code) for name, code in FIELDS[kind]])
+
+
+class TraceFile:
+    """Read-only view of a trace file.
+
+    The mapping stays valid as long as any array returned by records() or
+    column() is alive, even after close().
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"{path} is too short to be a trace file")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, kind, record_size, count = HEADER.unpack_from(self._map, 0)
+            kinds = {code: name for name, code in KINDS.items()}
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a trace file")
+            if version != VERSION or kind not in kinds:
+                raise ValueError(f"Unsupported trace file version {version}, kind {kind}")
+            self.kind = kinds[kind]
+            self._record = RECORDS[self.kind]
+            if record_size != self._record.size or HEADER.size + count * record_size > size:
+                raise ValueError(f"{path} is truncated or has a bad record size")
+        except Exception:
+            self._map.close()  # nothing else refers to a rejected file's mapping
+            raise
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        try:
+            self._map.close()
+        except BufferError:  # numpy views still point into the mapping; it is released with them
+            pass
+
+    def _body(self):
+        return memoryview(self._map)[HEADER.size:HEADER.size + self.count * self._record.size]
+
+    def __iter__(self):
+        """Records as tuples, decoded one at a time."""
+        with self._body() as body:
+            yield from self._record.iter_unpack(body)
+
+    def records(self):
+        """Structured numpy array over the mapping, no copy. Requires numpy."""
+        if np is None:
+            raise RuntimeError("numpy is required for records(); use column() or iterate instead")
+        return np.frombuffer(self._map, dtype=_dtype(self.kind), count=self.count, offset=HEADER.size)
+
+    def column(self, name):
+        """One field for every record: a strided view with numpy, an array('...') copy without."""
+        names = [field for field, _ in FIELDS[self.kind]]
+        if name not in names:
+            raise ValueError(f"{self.kind} traces have no field {name!r}")
+        if np is not None:
+            return self.records()[name]
+        index = names.index(name)
+        return array(FIELDS[self.kind][index][1], (record[index] for record in self))
+
+    def disk_events(self):
+        """(time, cylinder) or (time, cylinder, sector) tuples for DiskScheduler.replay."""
+        for time, cylinder, sector in self:
+            yield (time, cylinder) if sector < 0 else (time, cylinder, sector)
+
+    def address_events(self):
+        """(pid, address) tuples for PagingSystem.run_trace."""
+        for pid, _, address in self:
+            yield pid, address
+
+    def addresses(self, pid):
+        """The addresses referenced by one process, for PagingSystem.translate_trace."""
+        if np is not None:
+            records = self.records()
+            return records['address'][records['pid'] == pid]
+        return array('q', (address for record_pid, _, address in self if record_pid == pid))
+
+
+class TraceWriter:
+    """Append records one at a time; the count in the header is filled in on close."""
+
+    def __init__(self, path, kind):
+        if kind not in KINDS:
+            raise ValueError(f"Unknown trace kind: {kind}")
+        self.kind = kind
+        self.count = 0
+        self._record = RECORDS[kind]
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, KINDS[kind], self._record.size, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, *fields):
+        self._file.write(self._record.pack(*fields))
+        self.count += 1
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, KINDS[self.kind], self._record.size, self.count))
+        self._file.close()
+
+
+def write_trace(path, kind, records):
+    """Write a whole trace. With numpy, a structured array with the FIELDS of
+    `kind` is written in one go; any other iterable of tuples record by record."""
+    if np is not None and isinstance(records, np.ndarray):
+        records = np.asarray(records, dtype=_dtype(kind))
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, KINDS[kind], RECORDS[kind].size, len(records)))
+            f.write(records.tobytes())
+        return len(records)
+    with TraceWriter(path, kind) as writer:
+        for record in records:
+            writer.write(*record)
+    return writer.count
+
+
+def _parse_line(line, kind, sectors_per_cylinder, sectors_per_track, actions):
+    # One record from a CSV or blkparse line, or None for headers, comments and other events
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    fields = line.split()
+    try:
+        if len(fields) >= 8 and ',' in fields[0]:
+            # blkparse: dev cpu seq timestamp pid action rwbs sector + blocks [process]
+            if kind != 'disk' or fields[5] not in actions:
+                return None
+            lba = int(fields[7])
+            return float(fields[3]) * 1000, lba // sectors_per_cylinder, lba % sectors_per_track
+        fields = [field.strip() for field in line.split(',')]
+        if kind == 'disk':
+            # time_ms, cylinder[, sector]
+            return float(fields[0]), int(fields[1]), int(fields[2]) if len(fields) > 2 and fields[2] else -1
+        # pid, address[, op]
+        op = fields[2].upper() if len(fields) > 2 and fields[2] else 'R'
+        address = int(fields[1], 0)
+        return int(fields[0]), OPS[op] if op in OPS else int(op), address
+    except (ValueError, IndexError):
+        return None  # header row or a malformed line
+
+
+def convert_text(src, dst, kind='disk', sectors_per_cylinder=1008, sectors_per_track=63, actions=('Q',)):
+    """Convert a text trace to the binary format and return the record count.
+
+    disk:    'time_ms,cylinder[,sector]' CSV rows, or blkparse output where
+             the 'Q' (queued) events are kept and the LBA is split into
+             cylinder and sector.
+    address: 'pid,address[,op]' CSV rows; address may be hex (0x...) and op
+             is R, W or F.
+    Blank lines, '#' comments and header rows are skipped.
+    """
+    with open(src) as f, TraceWriter(dst, kind) as writer:
+        for line in f:
+            record = _parse_line(line, kind, sectors_per_cylinder, sectors_per_track, actions)
+            if record is not None:
+                writer.write(*record)
+    return writer.count
+
+
+def parse_requests(text):
+    """Disk requests from a comma-separated list, or the cylinders of a disk trace file."""
+    text = text.strip()
+    if os.path.isfile(text):
+        with TraceFile(text) as trace:
+            if trace.kind != 'disk':
+                raise ValueError(f"{text} is not a disk trace")
+            return trace.column('cylinder').tolist()
+    return [int(r.strip()) for r in text.split(',')]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert and inspect binary simulator traces.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    convert = commands.add_parser('convert', help="CSV or blkparse text -> binary trace")
+    convert.add_argument('src')
+    convert.add_argument('dst')
+    convert.add_argument('--kind', choices=sorted(KINDS), default='disk')
+    convert.add_argument('--sectors-per-cylinder', type=int, default=1008)
+    convert.add_argument('--sectors-per-track', type=int, default=63)
+    convert.add_argument('--actions', default='Q', help="blkparse actions to keep, e.g. 'Q' or 'QD'")
+    info = commands.add_parser('info', help="print the header and the first records")
+    info.add_argument('path')
+    info.add_argument('--head', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if args.command == 'convert':
+        count = convert_text(args.src, args.dst, args.kind, args.sectors_per_cylinder,
+                             args.sectors_per_track, tuple(args.actions))
+        print(f"{count} {args.kind} records written to {args.dst}")
+        return 0
+
+    with TraceFile(args.path) as trace:
+        print(f"{args.path}: {trace.kind} trace, {len(trace)} records")
+        names = [name for name, _ in FIELDS[trace.kind]]
+        for i, record in enumerate(trace):
+            if i >= args.head:
+                break
+            print("  " + ", ".join(f"{name}={value}" for name, value in zip(names, record)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,14 +5,18 @@ import subprocess
 import sys
 import os
 import io
+import queue
 import threading
 import traceback
 from contextlib import redirect_stdout
 
 # Import the logic from your existing files
 try:
-    from disk_scheduling import fcfs_disk_schedule, scan_disk_scheduling, cscan_disk_scheduling
-    from memory_management import PagingSystem, SegmentationSystem, MemoryAllocator
+    from disk_scheduling import (fcfs_disk_schedule, scan_disk_scheduling, cscan_disk_scheduling,
+                                 sstf_disk_scheduling, look_disk_scheduling, clook_disk_scheduling)
+    from memory_management import PagingSystem, SegmentationSystem, MemoryAllocator, BuddyAllocator, SlabAllocator
+    from trace_format import parse_requests
+    from Group5_Multithreading_and_Synchronization import run_demo
 except ImportError as e:
     # Use a simple tkinter messagebox if CTk isn't ready
     tk.messagebox.showerror("Error", f"Could not find required files: {e}\n\nPlease make sure all .py files are in the same directory.")
@@ -223,25 +227,48 @@ class UbuntuSimulator(ctk.CTk):
         output_box = ctk.CTkTextbox(parent_frame, wrap=tk.WORD, font=("Courier New", 10))
         output_box.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="nsew")
 
-        def stream_output(demo_name):
-            output_box.delete('1.0', tk.END)
-            output_box.insert(tk.END, f"--- Running {demo_name} ---\n\n")
+        # The demo runs in-process on a worker thread and puts its output lines
+        # on a queue; the Tk thread drains the queue every few milliseconds and
+        # inserts everything that arrived in one go. Each run has its own queue
+        # and only the latest run writes to the box.
+        DONE = object()
+        current = {'lines': None}
+
+        def stream_output(demo_name, lines):
             try:
-                cmd = ["python", "Group5_Multithreading_and_Synchronization.py", demo_name]
-                process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                                           text=True, encoding='utf-8', bufsize=1)
-                for line in iter(process.stdout.readline, ''):
-                    output_box.insert(tk.END, line)
-                    output_box.see(tk.END)
-                process.stdout.close()
-                process.wait()
-                output_box.insert(tk.END, f"\n--- {demo_name} Complete ---")
+                run_demo(demo_name, out=lines.put)
+                lines.put(f"\n--- {demo_name} Complete ---")
             except Exception as e:
-                output_box.insert(tk.END, f"\n--- ERROR ---\n{e}\n")
+                lines.put(f"\n--- ERROR ---\n{e}")
                 traceback.print_exc()
+            lines.put(DONE)
+
+        def drain_output(lines):
+            if lines is not current['lines']:
+                return # a newer run took over the box
+            batch = []
+            done = False
+            while True:
+                try:
+                    line = lines.get_nowait()
+                except queue.Empty:
+                    break
+                if line is DONE:
+                    done = True
+                    break
+                batch.append(line)
+            if batch:
+                output_box.insert(tk.END, "\n".join(batch) + "\n")
+                output_box.see(tk.END)
+            if not done:
+                output_box.after(30, drain_output, lines)
 
         def run_demo_threaded(demo_name):
-            threading.Thread(target=stream_output, args=(demo_name,), daemon=True).start()
+            output_box.delete('1.0', tk.END)
+            output_box.insert(tk.END, f"--- Running {demo_name} ---\n\n")
+            lines = current['lines'] = queue.Queue()
+            threading.Thread(target=stream_output, args=(demo_name, lines), daemon=True).start()
+            drain_output(lines)
 
         ctk.CTkButton(btn_frame, text="Race Condition", command=lambda: run_demo_threaded("race")).pack(side='left', padx=5, pady=5)
         ctk.CTkButton(btn_frame, text="Mutex Demo", command=lambda: run_demo_threaded("mutex_demo")).pack(side='left', padx=5, pady=5)
@@ -270,7 +297,7 @@ class UbuntuSimulator(ctk.CTk):
         ent_disk_size.grid(row=2, column=1, padx=10, pady=5, sticky='w')
         ent_disk_size.insert(0, "200")
 
-        ctk.CTkLabel(input_frame, text="SCAN Direction:").grid(row=3, column=0, padx=10, pady=5, sticky='w')
+        ctk.CTkLabel(input_frame, text="SCAN/LOOK Direction:").grid(row=3, column=0, padx=10, pady=5, sticky='w')
         scan_dir = ctk.StringVar(value="right")
         ctk.CTkRadioButton(input_frame, text="Left", variable=scan_dir, value="left").grid(row=3, column=1, sticky='w', padx=10)
         ctk.CTkRadioButton(input_frame, text="Right", variable=scan_dir, value="right").grid(row=3, column=2, sticky='w', padx=10)
@@ -283,7 +310,7 @@ class UbuntuSimulator(ctk.CTk):
 
         def run_alg(alg_name):
             try:
-                requests = [int(r.strip()) for r in ent_requests.get().split(',')]
+                requests = parse_requests(ent_requests.get())  # a list, or the path of a disk trace file
                 head = int(ent_head.get())
                 disk_size = int(ent_disk_size.get())
                 
@@ -291,12 +318,19 @@ class UbuntuSimulator(ctk.CTk):
                 output_box.insert(tk.END, f"--- Running {alg_name} ---\n\n")
                 
                 if alg_name == "FCFS":
-                    seq, seek = fcfs_disk_schedule(requests.copy(), head)
+                    seq, seek = fcfs_disk_schedule(requests, head)
                 elif alg_name == "SCAN":
                     direction = scan_dir.get()
-                    seq, seek = scan_disk_scheduling(requests.copy(), head, disk_size, direction)
+                    seq, seek = scan_disk_scheduling(requests, head, disk_size, direction)
                 elif alg_name == "C-SCAN":
-                    seq, seek = cscan_disk_scheduling(requests.copy(), head, disk_size)
+                    seq, seek = cscan_disk_scheduling(requests, head, disk_size)
+                elif alg_name == "SSTF":
+                    seq, seek = sstf_disk_scheduling(requests, head)
+                elif alg_name == "LOOK":
+                    direction = scan_dir.get()
+                    seq, seek = look_disk_scheduling(requests, head, direction)
+                elif alg_name == "C-LOOK":
+                    seq, seek = clook_disk_scheduling(requests, head)
                 
                 output_box.insert(tk.END, f"Seek Sequence: {seq}\n")
                 output_box.insert(tk.END, f"Total Seek Time: {seek}\n")
@@ -304,9 +338,8 @@ class UbuntuSimulator(ctk.CTk):
                 tk.messagebox.showerror("Input Error", f"Invalid input: {e}")
                 traceback.print_exc()
 
-        ctk.CTkButton(btn_frame, text="Run FCFS", command=lambda: run_alg("FCFS")).pack(side='left', padx=10, pady=5)
-        ctk.CTkButton(btn_frame, text="Run SCAN", command=lambda: run_alg("SCAN")).pack(side='left', padx=10, pady=5)
-        ctk.CTkButton(btn_frame, text="Run C-SCAN", command=lambda: run_alg("C-SCAN")).pack(side='left', padx=10, pady=5)
+        for i, alg_name in enumerate(("FCFS", "SCAN", "C-SCAN", "SSTF", "LOOK", "C-LOOK")):
+            ctk.CTkButton(btn_frame, text=f"Run {alg_name}", command=lambda a=alg_name: run_alg(a)).grid(row=i // 3, column=i % 3, padx=10, pady=5)
 
     def populate_memory_window(self, parent_frame):
         parent_frame.grid_rowconfigure(0, weight=1)
@@ -357,18 +390,25 @@ class UbuntuSimulator(ctk.CTk):
         ctk.CTkButton(controls, text="Alloc (Best Fit)", command=lambda: run_alloc_bf()).grid(row=1, column=1, pady=10, padx=5)
         ctk.CTkButton(controls, text="Free PID", command=lambda: run_alloc_free()).grid(row=1, column=2, pady=10, padx=5)
         ctk.CTkButton(controls, text="Show Map", command=lambda: show_map(), fg_color="gray").grid(row=1, column=3, pady=10, padx=5)
+        allocators = {"Contiguous": MemoryAllocator, "Buddy": BuddyAllocator, "Slab": SlabAllocator}
+        ctk.CTkLabel(controls, text="Strategy:").grid(row=2, column=0, sticky='w', padx=10)
+        ctk.CTkOptionMenu(controls, values=list(allocators), command=lambda name: switch_allocator(name)).grid(row=2, column=1, pady=5, padx=5, sticky='w')
         output_box = ctk.CTkTextbox(tab, wrap=tk.WORD, font=("Courier New", 10))
         output_box.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
         output_box.insert(tk.END, "Allocator initialized with 1000 units.\n")
 
+        def switch_allocator(name):
+            self.allocator = allocators[name](total_memory=1000)
+            output_box.insert(tk.END, f"\nSwitched to {name} allocator (1000 units).\n"); output_box.see(tk.END)
+
         def show_map():
             output = self.capture_print(self.allocator.print_map)
             output_box.insert(tk.END, f"\n{output}\n"); output_box.see(tk.END)
         def run_alloc_ff():
-            try: pid, size = ent_alloc_pid.get(), int(ent_alloc_size.get()); out = self.capture_print(self.allocator.first_fit, pid, size); output_box.insert(tk.END, out); show_map()
+            try: pid, size = ent_alloc_pid.get(), int(ent_alloc_size.get()); out = self.capture_print(self.allocator.allocate, pid, size); output_box.insert(tk.END, out); show_map()
             except Exception as e: output_box.insert(tk.END, f"Error: {e}\n"); traceback.print_exc()
         def run_alloc_bf():
-            try: pid, size = ent_alloc_pid.get(), int(ent_alloc_size.get()); out = self.capture_print(self.allocator.best_fit, pid, size); output_box.insert(tk.END, out); show_map()
+            try: pid, size = ent_alloc_pid.get(), int(ent_alloc_size.get()); out = self.capture_print(getattr(self.allocator, 'best_fit', self.allocator.allocate), pid, size); output_box.insert(tk.END, out); show_map()
             except Exception as e: output_box.insert(tk.END, f"Error: {e}\n"); traceback.print_exc()
         def run_alloc_free():
             try: pid = ent_alloc_pid.get(); out = self.capture_print(self.allocator.free, pid); output_box.insert(tk.END, out); show_map()
@@ -383,6 +423,7 @@ class UbuntuSimulator(ctk.CTk):
         ctk.CTkLabel(frame1, text="# Pages:").grid(row=1, column=2, sticky='w', padx=10)
         ent_page_num = ctk.CTkEntry(frame1, width=100); ent_page_num.grid(row=1, column=3, padx=5, pady=5, sticky='w')
         ctk.CTkButton(frame1, text="Allocate", command=lambda: run_page_alloc()).grid(row=1, column=4, padx=10, pady=5)
+        ctk.CTkButton(frame1, text="Free", command=lambda: run_page_free(), fg_color="gray").grid(row=1, column=5, padx=5, pady=5)
         frame2 = ctk.CTkFrame(tab); frame2.grid(row=1, column=0, padx=10, pady=10, sticky="ew")
         ctk.CTkLabel(frame2, text="--- Translate Address ---", font=ctk.CTkFont(weight="bold")).grid(row=0, column=0, columnspan=3, sticky='w', pady=5, padx=10)
         ctk.CTkLabel(frame2, text="PID:").grid(row=1, column=0, sticky='w', padx=10)
@@ -396,6 +437,9 @@ class UbuntuSimulator(ctk.CTk):
         def run_page_alloc():
             try: pid, num = ent_page_pid.get(), int(ent_page_num.get()); out = self.capture_print(self.paging_system.allocate_process, pid, num); output_box.insert(tk.END, f"\n{out}")
             except Exception as e: output_box.insert(tk.END, f"\nError: {e}\n"); traceback.print_exc()
+        def run_page_free():
+            try: pid = ent_page_pid.get(); out = self.capture_print(self.paging_system.free_process, pid); output_box.insert(tk.END, f"\n{out}")
+            except Exception as e: output_box.insert(tk.END, f"\nError: {e}\n"); traceback.print_exc()
         def run_page_trans():
             try: pid, addr = ent_page_t_pid.get(), int(ent_page_t_addr.get()); out = self.capture_print(self.paging_system.translate_address, pid, addr); output_box.insert(tk.END, f"\n{out}")
             except Exception as e: output_box.insert(tk.END, f"\nError: {e}\n"); traceback.print_exc()
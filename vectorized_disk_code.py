@@ -0,0 +1,62 @@
+# Array-backed versions of FCFS, SCAN and C-SCAN for very large request traces.
+# Same results as fcfs_code / scan_code / cscan_code, but the whole trace is
+# handled with numpy sort, searchsorted, diff and abs instead of a Python loop.
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the list versions still work without it
+    np = None
+
+
+def _as_array(requests):
+    # np.asarray accepts ndarray and array('i') without copying
+    return np.asarray(requests)
+
+
+def _movement(head, seq):
+    # Total distance travelled when the head visits every cylinder in seq, in order
+    if seq.size == 0:
+        return 0
+    moves = np.abs(np.diff(seq.astype(np.int64), prepend=np.int64(head)))
+    return int(moves.sum())
+
+
+def fcfs_disk_schedule_np(requests, head):
+    seek_sequence = np.array(_as_array(requests))
+    return seek_sequence, _movement(head, seek_sequence)
+
+
+def _ordered(requests, presorted):
+    # np.sort returns a copy, so the caller's array is never reordered
+    return _as_array(requests) if presorted else np.sort(_as_array(requests))
+
+
+def scan_disk_scheduling_np(requests, head, disk_size, direction, presorted=False):
+    ordered = _ordered(requests, presorted)
+    split = int(np.searchsorted(ordered, head, side='left'))
+    left, right = ordered[:split], ordered[split:]
+
+    if direction == "left":
+        boundary = np.zeros(1, dtype=ordered.dtype)
+        seek_sequence = np.concatenate((left[::-1], boundary, right))
+    else:
+        seek_sequence = np.concatenate((right, left[::-1]))
+
+    return seek_sequence, _movement(head, seek_sequence)
+
+
+def cscan_disk_scheduling_np(requests, head, disk_size, presorted=False):
+    ordered = _ordered(requests, presorted)
+    split = int(np.searchsorted(ordered, head, side='left'))
+    left, right = ordered[:split], ordered[split:]
+
+    seek_sequence = np.concatenate((right, left))
+    seek_time = _movement(head, right)
+
+    if left.size:
+        current = int(right[-1]) if right.size else head
+        seek_time += abs(current - (disk_size - 1))  # go to end
+        seek_time += disk_size - 1  # jump to start
+        seek_time += _movement(0, left)
+
+    return seek_sequence, seek_time